@@ -3,6 +3,7 @@ from .auth import (
     DeviceIDCookieDep,
     OAuth2PasswordRequestFormDep,
     OTPUserDep,
+    RefreshTokenCookieDep,
     RefreshUserDep,
     ReqDeviceDep,
     ReqIpDep,
@@ -11,4 +12,12 @@ from .auth import (
     UserDep,
 )
 from .cache import AsyncRedisClientDep, MQDefault, MQHigh, MQLow
-from .db import DbDep
+from .db import DbDep, ReadDbDep
+from .events import NotifierDep
+from .rate_limit import (
+    rate_limit_login,
+    rate_limit_otp,
+    rate_limit_refresh,
+    rate_limit_register,
+)
+from .responses import AcceptMediaTypeDep
@@ -1,13 +1,19 @@
+import asyncio
+import uuid
 from typing import Annotated
 
-from fastapi import Cookie, Depends, Request
+from fastapi import Cookie, Depends
 from fastapi.security import OAuth2PasswordRequestForm
 from pydantic import IPvAnyAddress
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.requests import HTTPConnection
 
-from app import cache, models
+from app import cache, models, schemas
 from app.api.deps.cache import AsyncRedisClientDep
 from app.api.deps.db import DbDep
+from app.cache.client import AsyncRedisClient
 from app.db import repos as repo
+from app.db.session import release_connection
 from app.schemas.enums import CookieKey
 from app.schemas.token import AccessTokenClaim, OTPTokenClaim, RefreshTokenClaim
 from app.utils.exceptions import (
@@ -16,14 +22,14 @@ from app.utils.exceptions import (
 )
 
 
-def get_ip(req: Request) -> IPvAnyAddress:
-    """Returns the IP address of the client making the request"""
+def get_ip(req: HTTPConnection) -> IPvAnyAddress:
+    """Returns the IP address of the client making the request (or websocket)"""
     if ip := req.headers.get("X-Forwarded-For"):
         return IPvAnyAddress(ip.split(",", 1)[0])  # type: ignore
     return IPvAnyAddress(req.client.host)  # type: ignore
 
 
-def get_user_agent(req: Request) -> str:
+def get_user_agent(req: HTTPConnection) -> str:
     """Returns the user agent of the client making the request"""
     return req.headers.get("User-Agent", "")
 
@@ -48,6 +54,7 @@ async def get_curr_device(
     """
     if device_id:
         device = await repo.device.get(db, id=device_id)
+        await release_connection(db)
         return device
     return None
 
@@ -69,34 +76,71 @@ ReqDeviceDep = Annotated[models.Device | None, Depends(get_curr_device)]
 ReqVerifiedDeviceDep = Annotated[models.Device | None, Depends(get_curr_verified_device)]
 
 
+async def get_principal(
+    rc: AsyncRedisClient,
+    db: AsyncSession,
+    *,
+    user_id: uuid.UUID | str,
+    device_id: str,
+) -> schemas.Principal | None:
+    """
+    Returns the principal of the user device session.
+    Served from cache & only loaded from the db on a cache miss,
+    the db connection is released right after (see `release_connection`)
+    """
+    principal = await cache.principals.get(rc, user_id=user_id, device_id=device_id)
+    if principal is not None:
+        return principal
+
+    principal = await repo.user.get_principal(db, id=user_id, device_id=device_id)
+    await release_connection(db)
+    if principal:
+        await cache.principals.save(rc, device_id=device_id, principal=principal)
+    return principal
+
+
+async def get_device_session(
+    rc: AsyncRedisClient,
+    db: AsyncSession,
+    *,
+    user_id: uuid.UUID | str,
+    device_id: str,
+) -> tuple[RefreshTokenClaim | None, schemas.Principal | None]:
+    """
+    Returns the validator refresh token of the user device session & its principal.
+    The lookups are independent, so they run concurrently.
+    """
+    rt_key = cache.keys.refresh_token(user_id, device_id)
+    rt_claim, principal = await asyncio.gather(
+        cache.tokens.get(rc, key=rt_key, token_cls=RefreshTokenClaim),
+        get_principal(rc, db, user_id=user_id, device_id=device_id),
+    )
+    return rt_claim, principal
+
+
 async def get_current_user(
     rc: AsyncRedisClientDep,
     db: DbDep,
     req_ip: ReqIpDep,
     req_device_id: DeviceIDCookieDep = None,
     token: AccessTokenCookieDep = None,
-) -> models.User:
+) -> schemas.Principal:
     """
     Returns the user making the request
     with the given access token
     if it is still valid
     and with a verified device
     """
-    if not token:
-        raise AuthenticationException
-
-    is_verified_device = await repo.device.is_verified(db, id=req_device_id)
-
-    if not is_verified_device:
+    if not token or not req_device_id:
         raise AuthenticationException
 
     at_claim = AccessTokenClaim.from_encoded(token)
 
-    rt_key = cache.keys.refresh_token(at_claim.sub, req_device_id)
-    rt_claim = await cache.tokens.get(
+    rt_claim, principal = await get_device_session(
         rc,
-        key=rt_key,
-        token_cls=RefreshTokenClaim,
+        db,
+        user_id=at_claim.sub,
+        device_id=req_device_id,
     )
 
     if (
@@ -106,17 +150,19 @@ async def get_current_user(
     ):  # fmt: off
         raise AuthenticationException
 
-    user = await repo.user.get(db, id=at_claim.sub)
-
-    if not user or not user.is_active:
+    if (
+        principal is None \
+        or not principal.is_active \
+        or not principal.device_verified
+    ):  # fmt: off
         raise AuthenticationException
 
-    return user
+    return principal
 
 
 async def get_current_admin(
-    user: Annotated[models.User, Depends(get_current_user)],
-) -> models.User:
+    user: Annotated[schemas.Principal, Depends(get_current_user)],
+) -> schemas.Principal:
     """
     Returns the user making the request
     if they are an admin
@@ -133,19 +179,17 @@ async def get_refresh_user(
     req_device_id: DeviceIDCookieDep = None,
     access_token: AccessTokenCookieDep = None,
     refresh_token: RefreshTokenCookieDep = None,
-) -> models.User:
+) -> schemas.Principal:
     """
     Returns the user making the request
     with the given refresh and access tokens
     if refresh token is still valid
     but access token is expired
-    """
-    if not refresh_token or not access_token:
-        raise AuthenticationException
-
-    is_verified_device = await repo.device.is_verified(db, id=req_device_id)
 
-    if not is_verified_device:
+    The refresh token is validated against the cached one
+    when it is rotated (see `cache.tokens.rotate`)
+    """
+    if not refresh_token or not access_token or not req_device_id:
         raise AuthenticationException
 
     rt_claim = RefreshTokenClaim.from_encoded(refresh_token)
@@ -153,30 +197,26 @@ async def get_refresh_user(
 
     if (
         at_claim.jti != rt_claim.jti \
-        or at_claim.sub != rt_claim.sub
+        or at_claim.sub != rt_claim.sub \
+        or str(req_ip) != str(rt_claim.ip)
     ):  # fmt: off
         raise AuthenticationException
 
-    validator_rt_key = cache.keys.refresh_token(rt_claim.sub, req_device_id)
-    validator_rt = await cache.tokens.get(
+    principal = await get_principal(
         rc,
-        key=validator_rt_key,
-        token_cls=RefreshTokenClaim,
+        db,
+        user_id=rt_claim.sub,
+        device_id=req_device_id,
     )
 
     if (
-        validator_rt is None \
-        or rt_claim.jti != validator_rt.jti \
-        or str(req_ip) != str(rt_claim.ip)
+        principal is None \
+        or not principal.is_active \
+        or not principal.device_verified
     ):  # fmt: off
         raise AuthenticationException
 
-    user = await repo.user.get(db, id=rt_claim.sub)
-
-    if not user or not user.is_active:
-        raise AuthenticationException
-
-    return user
+    return principal
 
 
 async def get_otp_user(
@@ -194,6 +234,7 @@ async def get_otp_user(
     otp_claim = OTPTokenClaim.from_encoded(token)
 
     user = await repo.user.get(db, id=str(otp_claim.sub))
+    await release_connection(db)
 
     if not user:
         raise AuthenticationException
@@ -203,6 +244,6 @@ async def get_otp_user(
 
 OAuth2PasswordRequestFormDep = Annotated[OAuth2PasswordRequestForm, Depends()]
 OTPUserDep = Annotated[models.User, Depends(get_otp_user)]
-RefreshUserDep = Annotated[models.User, Depends(get_refresh_user)]
-UserDep = Annotated[models.User, Depends(get_current_user)]
-AdminDep = Annotated[models.User, Depends(get_current_admin)]
+RefreshUserDep = Annotated[schemas.Principal, Depends(get_refresh_user)]
+UserDep = Annotated[schemas.Principal, Depends(get_current_user)]
+AdminDep = Annotated[schemas.Principal, Depends(get_current_admin)]
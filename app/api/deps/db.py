@@ -2,14 +2,19 @@ from collections.abc import AsyncGenerator
 from typing import Annotated
 
 from fastapi import Depends
-from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.exc import DBAPIError, SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.session import AsyncSessionFactory
+from app.db.session import REPLICA, AsyncSessionFactory, read_session, replicas
 
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
-    """Yields a db session from the pool"""
+    """
+    Yields a db session.
+    A pooled connection is only acquired on its first statement
+    (requests served from cache never acquire one).
+    Dependencies release it once done reading (see `release_connection`)
+    """
     async with AsyncSessionFactory() as session:
         session: AsyncSession
         try:
@@ -18,5 +23,23 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             raise e
 
 
+async def get_read_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Yields a db session reading from a replica (see `RoutingSession`)
+    for read mostly requests.
+    A replica losing its connection is marked down till it passes a health check.
+    """
+    async with read_session() as session:
+        session: AsyncSession
+        try:
+            yield session
+        except DBAPIError as e:
+            replica = session.info.get(REPLICA)
+            if replica is not None and e.connection_invalidated:
+                replicas.mark_down(replica)
+            raise e
+
+
 """ Annotated Dependency """
 DbDep = Annotated[AsyncSession, Depends(get_db)]
+ReadDbDep = Annotated[AsyncSession, Depends(get_read_db)]
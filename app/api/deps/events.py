@@ -0,0 +1,20 @@
+from collections.abc import AsyncIterator
+from typing import Annotated
+
+from fastapi import Depends
+
+from app.api.deps.cache import AsyncRedisClientDep
+from app.events import Notifier
+
+
+async def get_notifier(rc: AsyncRedisClientDep) -> AsyncIterator[Notifier]:
+    """
+    Yields a notifier collecting the sync events of the request.
+    Events are published only if the request succeeded
+    """
+    notifier = Notifier(rc)
+    yield notifier
+    await notifier.flush()
+
+
+NotifierDep = Annotated[Notifier, Depends(get_notifier)]
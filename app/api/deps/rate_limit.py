@@ -0,0 +1,120 @@
+"""
+Rate limits of the credentials checking endpoints
+
+Meant to be route (decorator) dependencies, so they are resolved
+before the endpoint dependencies: limited requests are refused
+before any db query or password hashing.
+"""
+
+from typing import Annotated
+
+from fastapi import Path
+from pydantic import IPvAnyAddress
+
+from app import cache
+from app.api.deps.auth import (
+    OAuth2PasswordRequestFormDep,
+    OTPTokenCookieDep,
+    RefreshTokenCookieDep,
+    ReqIpDep,
+)
+from app.api.deps.cache import AsyncRedisClientDep
+from app.cache.client import AsyncRedisClient
+from app.cache.service import RateLimit
+from app.core import security
+from app.core.config import settings
+from app.schemas.token import OTPTokenClaim, RefreshTokenClaim
+from app.utils.exceptions import TooManyRequestsException
+
+
+async def enforce_rate_limit(
+    rc: AsyncRedisClient,
+    *,
+    scope: str,
+    ip: IPvAnyAddress | None = None,
+    account: str | None = None,
+) -> None:
+    """
+    Counts the request against the ip and/or account limits of the scope
+
+    Raises:
+        TooManyRequestsException: if any of the limits is exceeded
+    """
+    if not settings.RATE_LIMIT_ENABLED:
+        return
+
+    window = settings.RATE_LIMIT_WINDOW_SECONDS
+    limits: list[RateLimit] = []
+    if ip:
+        limits.append(
+            RateLimit(
+                key=cache.keys.rate_limit(scope, f"ip:{ip}"),
+                limit=settings.RATE_LIMIT_PER_IP,
+                window=window,
+            )
+        )
+    if account:
+        limits.append(
+            RateLimit(
+                key=cache.keys.rate_limit(scope, account),
+                limit=settings.RATE_LIMIT_PER_ACCOUNT,
+                window=window,
+            )
+        )
+
+    if limits and (retry_after := await cache.rate_limits.hit(rc, limits=limits)):
+        raise TooManyRequestsException(retry_after=retry_after)
+
+
+async def rate_limit_register(
+    rc: AsyncRedisClientDep,
+    req_ip: ReqIpDep,
+    registration_token: Annotated[str, Path(...)],
+) -> None:
+    """Limits registration attempts per ip & registration token (hashed in the key)"""
+    account = security.sha256_hash(registration_token.encode())
+    await enforce_rate_limit(rc, scope="register", ip=req_ip, account=account)
+
+
+async def rate_limit_login(
+    rc: AsyncRedisClientDep,
+    req_ip: ReqIpDep,
+    form_data: OAuth2PasswordRequestFormDep,
+) -> None:
+    """Limits login attempts per ip & email"""
+    email = form_data.username.strip().lower()
+    await enforce_rate_limit(rc, scope="login", ip=req_ip, account=email)
+
+
+async def rate_limit_otp(
+    rc: AsyncRedisClientDep,
+    req_ip: ReqIpDep,
+    token: OTPTokenCookieDep = None,
+) -> None:
+    """
+    Limits OTP attempts per ip & user
+
+    The ip hit is counted before decoding the token,
+    so invalid or expired tokens count against the ip limit too
+    """
+    await enforce_rate_limit(rc, scope="otp", ip=req_ip)
+    if token:
+        account = str(OTPTokenClaim.from_encoded(token).sub)
+        await enforce_rate_limit(rc, scope="otp", account=account)
+
+
+async def rate_limit_refresh(
+    rc: AsyncRedisClientDep,
+    req_ip: ReqIpDep,
+    refresh_token: RefreshTokenCookieDep = None,
+) -> None:
+    """
+    Limits token refreshes per ip & user
+
+    The ip hit is counted before decoding the token,
+    so invalid or expired tokens count against the ip limit too
+    """
+    await enforce_rate_limit(rc, scope="refresh", ip=req_ip)
+    if refresh_token:
+        account = str(RefreshTokenClaim.from_encoded(refresh_token).sub)
+        await enforce_rate_limit(rc, scope="refresh", account=account)
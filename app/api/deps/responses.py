@@ -0,0 +1,15 @@
+from typing import Annotated
+
+from fastapi import Depends, Header
+
+from app.utils.responses import negotiate_media_type
+
+
+def get_accept_media_type(
+    accept: Annotated[str | None, Header(description="Response media type")] = None,
+) -> str:
+    """Returns the response media type accepted by the client (json by default)"""
+    return negotiate_media_type(accept)
+
+
+AcceptMediaTypeDep = Annotated[str, Depends(get_accept_media_type)]
@@ -0,0 +1,50 @@
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core import metrics
+
+
+class MetricsMiddleware:
+    """
+    Records the latency & response size of http requests per route template
+    (rather than per path, to keep the metrics cardinality bounded)
+    & the requests in flight.
+
+    Pure ASGI middleware, so streamed responses (e.g. server sent events)
+    are timed till they are fully sent.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+        size = 0
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code, size
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        in_flight = metrics.HTTP_REQUESTS_IN_FLIGHT.labels(method)
+        in_flight.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            in_flight.dec()
+            route = scope.get("route")
+            template = getattr(route, "path_format", None) or "unmatched"
+            metrics.HTTP_REQUEST_SECONDS.labels(method, template, status_code).observe(
+                time.perf_counter() - start
+            )
+            metrics.HTTP_RESPONSE_BYTES.labels(method, template).observe(size)
@@ -1,7 +1,14 @@
-from fastapi import APIRouter, status
+import secrets
+from typing import Annotated
+
+from fastapi import APIRouter, Header, status
 from fastapi.responses import HTMLResponse, Response
 
+from app.api.deps import AdminDep
 from app.api.routes import v1
+from app.core import metrics
+from app.core.config import settings
+from app.db.session import async_engine, replicas, statement_cache_stats
 
 router = APIRouter()
 
@@ -24,5 +31,40 @@ async def health():
     return Response(status_code=status.HTTP_200_OK)
 
 
+@router.get("/metrics", include_in_schema=False)
+async def prometheus_metrics(authorization: Annotated[str | None, Header()] = None):
+    """
+    Prometheus metrics (disabled by default, see `METRICS_ENABLED`)
+
+    Scrapers must send `Authorization: Bearer <METRICS_SCRAPE_TOKEN>` if the token is set,
+    else the endpoint should only be reachable from the internal network.
+    """
+    if not settings.METRICS_ENABLED:
+        return Response(status_code=status.HTTP_404_NOT_FOUND)
+    token = settings.METRICS_SCRAPE_TOKEN
+    if token and not secrets.compare_digest(authorization or "", f"Bearer {token}"):
+        return Response(status_code=status.HTTP_401_UNAUTHORIZED)
+    data, content_type = metrics.render()
+    return Response(content=data, media_type=content_type)
+
+
+@router.get("/health/db")
+async def db_health(admin: AdminDep) -> dict[str, dict]:
+    """
+    ## Database stats of the worker (admin only)
+
+    * Connection pool usage per engine (primary & replicas)
+    * Prepared statements cache hit rate per engine
+    """
+    pools = {engine.pool.name: engine.pool for engine in [async_engine, *replicas.engines]}
+    return {
+        name: {
+            "pool": pools[name].stats() if name in pools else None,
+            "statement_cache": stats.as_dict(),
+        }
+        for name, stats in statement_cache_stats.items()
+    }
+
+
 # Include subrouters
 router.include_router(prefix="/v1", router=v1.router, tags=["v1"])
@@ -1,6 +1,6 @@
 from fastapi import APIRouter
 
-from app.api.routes.v1 import auth, collection, invite, secrets, sync, user
+from app.api.routes.v1 import auth, collection, export, invite, secrets, sync, user
 
 router = APIRouter()
 
@@ -11,3 +11,4 @@ router.include_router(prefix="/sync", router=sync.router, tags=["sync"])
 router.include_router(prefix="/invite", router=invite.router, tags=["invite"])
 router.include_router(prefix="/secrets", router=secrets.router, tags=["secrets"])
 router.include_router(prefix="/collection", router=collection.router, tags=["collection"])
+router.include_router(prefix="/export", router=export.router, tags=["export"])
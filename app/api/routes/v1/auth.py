@@ -2,7 +2,7 @@ import uuid
 from typing import Annotated
 
 import rq
-from fastapi import APIRouter, Body, Path, Response, status
+from fastapi import APIRouter, Body, Depends, Path, Response, status
 from pydantic import IPvAnyAddress
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -14,11 +14,16 @@ from app.api.deps import (
     MQHigh,
     OAuth2PasswordRequestFormDep,
     OTPUserDep,
+    RefreshTokenCookieDep,
     RefreshUserDep,
     ReqIpDep,
     ReqUserAgentDep,
     ReqVerifiedDeviceDep,
     UserDep,
+    rate_limit_login,
+    rate_limit_otp,
+    rate_limit_refresh,
+    rate_limit_register,
 )
 from app.cache.client import AsyncRedisClient
 from app.core import security, tokens
@@ -39,9 +44,13 @@ from app.utils.exceptions import (
 router = APIRouter()
 
 
-@router.post("/register/{registration_token}")
+@router.post(
+    "/register/{registration_token}",
+    dependencies=[Depends(rate_limit_register)],
+)
 async def register(
     db: DbDep,
+    rc: AsyncRedisClientDep,
     req_ip: ReqIpDep,
     req_user_agent: ReqUserAgentDep,
     registration_token: Annotated[str, Path(...)],
@@ -62,6 +71,7 @@ async def register(
     * User has not been activated account yet
 
     ## Overview
+    * Rate limited per ip & registration token (429)
     * Validates registration token
     * Validates user account
     * Hashes & sets the new user password (already double KDF hashed by client)
@@ -81,12 +91,15 @@ async def register(
     if invitee.is_active:
         raise UserAlreadyActiveException
 
-    invitee.update_password(password).verify_email().activate()
+    await invitee.update_password(password)
+    invitee.verify_email().activate()
 
     await repo.invitation.invalidate_tokens(db, user_id=invitee.id)
 
     await db.commit()
 
+    await cache.principals.invalidate(rc, user_id=invitee.id)
+
     await register_new_device(
         db=db,
         res=res,
@@ -102,6 +115,7 @@ async def register(
 
 @router.post(
     "/oauth2",
+    dependencies=[Depends(rate_limit_login)],
     responses={
         status.HTTP_200_OK: {
             "description": "User authenticated successfully",
@@ -136,6 +150,7 @@ async def oauth2_login(
     registered device/browser.
 
     ## Overview
+    * Rate limited per ip & email (429)
     * Extracts device_id from cookie & user agent from request header
     * Validates user credentials
     * Registers new device if user is logging in with a new device/browser
@@ -179,13 +194,14 @@ async def oauth2_login(
         return await grant_autherization_code(rc=rc, mq=mq, user=user, ip=req_ip, res=res)
 
 
-@router.post("/refresh")
+@router.post("/refresh", dependencies=[Depends(rate_limit_refresh)])
 async def refresh(
     res: Response,
     req_ip: ReqIpDep,
     user: RefreshUserDep,
     rc: AsyncRedisClientDep,
     req_device_id: DeviceIDCookieDep = None,
+    refresh_token: RefreshTokenCookieDep = None,
 ) -> Response:
     """
     ## Refresh access token
@@ -195,26 +211,29 @@ async def refresh(
     * User Device/Browser is registered & verified
 
     ## Overview
+    * Rate limited per ip & user (429)
     * Validates refresh & the expired access tokens
+    * Atomically rotates the cached refresh token
+    (concurrent refreshes with the same token: only one succeeds)
     * Returns new access & refresh tokens
 
     ## Cookies
     * **vaultexe_access_token**
     * **vaultexe_refresh_token**
     """
-    if not req_device_id:
+    if not req_device_id or not refresh_token:
         raise AuthenticationException
     return await grant_web_token(
         rc=rc,
         res=res,
         user=user,
         ip=req_ip,
-        is_refresh=True,
         device_id=req_device_id,
+        rotated_claim=schemas.RefreshTokenClaim.from_encoded(refresh_token),
     )
 
 
-@router.post("/otp")
+@router.post("/otp", dependencies=[Depends(rate_limit_otp)])
 async def otp_login(
     db: DbDep,
     ip: ReqIpDep,
@@ -231,6 +250,7 @@ async def otp_login(
     * User has been authenticated via oauth2 login
 
     ## Overview
+    * Rate limited per ip & user (429)
     * Validates otp
     * Delete cached otp hash claim
     * Returns access & refresh tokens
@@ -264,6 +284,8 @@ async def otp_login(
     await repo.device.verify(db, id=req_device_id)
     await db.commit()
 
+    await cache.principals.invalidate(rc, user_id=user.id, device_id=req_device_id)
+
     res.delete_cookie(key=CookieKey.OTP_TOKEN)
 
     return await grant_web_token(rc=rc, user=user, ip=ip, device_id=req_device_id, res=res)
@@ -280,11 +302,17 @@ async def logout(
     ## Logout
 
     ## Overview
-    * Deletes refresh token claim from redis
+    * Deletes refresh token claim & cached principal from redis
     * Deletes access & refresh token cookies
     """
-    key = cache.keys.refresh_token(user.id, req_device_id)
-    await rc.unlink(key)
+    await cache.tokens.revoke(
+        rc,
+        key=cache.keys.refresh_token(user.id, req_device_id),
+        index_key=cache.keys.refresh_tokens_index(user.id),
+    )
+
+    if req_device_id:
+        await cache.principals.invalidate(rc, user_id=user.id, device_id=req_device_id)
 
     res.delete_cookie(key=CookieKey.ACCESS_TOKEN)
     res.delete_cookie(key=CookieKey.REFRESH_TOKEN)
@@ -296,37 +324,36 @@ async def logout(
 @router.post("/logout/all")
 async def logout_all(
     res: Response,
-    db: DbDep,
     user: UserDep,
     rc: AsyncRedisClientDep,
-) -> list[schemas.Device]:
+) -> list[str]:
     """
     ## Logout from all devices
 
     ## Overview
-    * Deletes all refresh token claims from redis
+    * Deletes all refresh token claims & cached principals from redis
     * Deletes access & refresh token cookies in requesting device
-    """
-    devices = await repo.device.get_logged_in_devices(db, user_id=user.id)
-    keys = [cache.keys.refresh_token(user.id, device.id) for device in devices]
 
-    await rc.unlink(*keys)
+    Returns:
+        list[str]: Ids of the logged out devices
+    """
+    device_ids = await revoke_sessions(rc, user_id=user.id)
 
     res.delete_cookie(key=CookieKey.ACCESS_TOKEN)
     res.delete_cookie(key=CookieKey.REFRESH_TOKEN)
 
     res.status_code = status.HTTP_200_OK
-    return [schemas.Device.model_validate(device) for device in devices]
+    return device_ids
 
 
 async def grant_web_token(
     *,
     rc: AsyncRedisClient,
-    user: models.User,
+    user: models.User | schemas.Principal,
     ip: IPvAnyAddress,
     device_id: str,
     res: Response,
-    is_refresh: bool = False,
+    rotated_claim: schemas.RefreshTokenClaim | None = None,
 ) -> Response:
     """
     ## Generates & returns access & refresh tokens
@@ -341,7 +368,9 @@ async def grant_web_token(
     (aka: refresh token rotation)
 
     Args:
-        is_refresh (bool, optional): If true, the refresh token will be cached but maintain its ttl.
+        rotated_claim (RefreshTokenClaim, optional): Claim of the refresh token being rotated.
+            If given, the cached refresh token is replaced (keeping its ttl)
+            only if it is still the rotated one, else AuthenticationException is raised.
     """
     _, at, rt_claim, rt = tokens.create_web_tokens(
         ip=ip,
@@ -349,12 +378,23 @@ async def grant_web_token(
         is_admin=user.is_admin,
     )
 
-    await cache.tokens.save(
+    rt_key = cache.keys.refresh_token(user.id, device_id)
+
+    if rotated_claim is None:
+        await cache.tokens.save(
+            rc,
+            key=rt_key,
+            token_claim=rt_claim,
+            index_key=cache.keys.refresh_tokens_index(user.id),
+        )
+    elif not await cache.tokens.rotate(
         rc,
-        keep_ttl=is_refresh,
+        key=rt_key,
         token_claim=rt_claim,
-        key=cache.keys.refresh_token(user.id, device_id),
-    )
+        expected_jti=rotated_claim.jti,
+        expected_ip=ip,
+    ):
+        raise AuthenticationException
 
     res.status_code = status.HTTP_200_OK
 
@@ -378,6 +418,23 @@ async def grant_web_token(
     return res
 
 
+async def revoke_sessions(rc: AsyncRedisClient, *, user_id: uuid.UUID) -> list[str]:
+    """
+    Revokes all refresh tokens of the user & drops its cached principals
+    in a single redis round trip (no database query, see `cache.keys.refresh_tokens_index`)
+
+    Returns:
+        list[str]: Ids of the devices whose sessions were revoked
+    """
+    revoked = await cache.tokens.revoke_all(
+        rc,
+        index_key=cache.keys.refresh_tokens_index(user_id),
+        extra_keys=[cache.keys.principal(user_id)],
+    )
+    token_key_prefix = cache.keys.refresh_token(user_id, "")
+    return [key.removeprefix(token_key_prefix) for key in revoked]
+
+
 async def grant_autherization_code(
     *,
     mq: rq.Queue,
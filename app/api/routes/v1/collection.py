@@ -5,29 +5,36 @@ from fastapi import APIRouter, Body, Path, status
 from sqlalchemy.exc import IntegrityError
 
 from app import models, schemas
-from app.api.deps import DbDep, UserDep
-from app.api.deps.cache import AsyncRedisClientDep
+from app.api.deps import AcceptMediaTypeDep, DbDep, NotifierDep, UserDep
+from app.cache.decorators import cached_response
 from app.db import repos as repo
-from app.events import notify
-from app.schemas.enums import Op
+from app.schemas.enums import Op, VaultEntity
 from app.utils.exceptions import DuplicateEntityException, EntityNotFoundException
+from app.utils.responses import SchemaResponse, schema_response, validate_rows
 
 router = APIRouter()
 
 
-@router.get("/")
+@router.get("/", response_model=list[schemas.Collection])
+@cached_response("collections")
 async def get_collections(
     db: DbDep,
     user: UserDep,
-) -> list[schemas.Collection]:
+    media_type: AcceptMediaTypeDep,
+) -> SchemaResponse:
     # TODO: Use pagination
     collections = await repo.collection._get_all(db, user_id=user.id)
-    return [schemas.Collection.model_validate(collection) for collection in collections]
+    return schema_response(
+        validate_rows(schemas.Collection, collections),
+        type_=list[schemas.Collection],
+        media_type=media_type,
+    )
 
 
 @router.post(
     "/",
     status_code=status.HTTP_201_CREATED,
+    response_model=schemas.Collection,
     responses={
         status.HTTP_409_CONFLICT: {"description": "Collection already exists"},
         status.HTTP_201_CREATED: {"description": "Collection created"},
@@ -36,9 +43,10 @@ async def get_collections(
 async def create_collection(
     db: DbDep,
     user: UserDep,
-    rc: AsyncRedisClientDep,
+    notifier: NotifierDep,
+    media_type: AcceptMediaTypeDep,
     new_collection: Annotated[schemas.CollectionCreate, Body(...)],
-) -> schemas.Collection:
+) -> SchemaResponse:
     """
     ## Add new collection
 
@@ -48,10 +56,12 @@ async def create_collection(
     with a create event
     """
     try:
+        revision = await repo.user.bump_revision(db, user_id=user.id)
         collection = await repo.collection.create(
             db,
             user_id=user.id,
             obj_in=new_collection,
+            revision=revision,
         )
         await db.commit()
         await db.refresh(collection)
@@ -60,18 +70,24 @@ async def create_collection(
         raise DuplicateEntityException(models.Collection)
 
     collection = schemas.Collection.model_validate(collection)
-    await notify(rc, user_id=user.id, data=collection, action=Op.CREATE)
-    return collection
+    notifier.add(user_id=user.id, data=collection, action=Op.CREATE)
+    return schema_response(
+        collection,
+        type_=schemas.Collection,
+        media_type=media_type,
+        status_code=status.HTTP_201_CREATED,
+    )
 
 
-@router.put("/{collection_id}")
+@router.put("/{collection_id}", response_model=schemas.Collection)
 async def update_collection(
     db: DbDep,
     user: UserDep,
-    rc: AsyncRedisClientDep,
+    notifier: NotifierDep,
+    media_type: AcceptMediaTypeDep,
     collection_id: Annotated[uuid.UUID, Path(...)],
     collection_update: Annotated[schemas.CollectionUpdate, Body(...)],
-) -> schemas.Collection:
+) -> SchemaResponse:
     """
     ## Update collection
 
@@ -80,24 +96,25 @@ async def update_collection(
     connected devices via redis pubsub
     with a update event
     """
-    collection = await repo.collection.get(db, id=collection_id)
+    collection = await repo.collection.get_owned(db, id=collection_id, user_id=user.id)
     if not collection:
         raise EntityNotFoundException("Collection")
 
     collection.import_from(collection_update)
+    collection.revision = await repo.user.bump_revision(db, user_id=user.id)
     await db.commit()
     await db.refresh(collection)
 
     collection = schemas.Collection.model_validate(collection)
-    await notify(rc, user_id=user.id, data=collection, action=Op.UPDATE)
-    return collection
+    notifier.add(user_id=user.id, data=collection, action=Op.UPDATE)
+    return schema_response(collection, type_=schemas.Collection, media_type=media_type)
 
 
 @router.delete("/{collection_id}")
 async def delete_collection(
     db: DbDep,
     user: UserDep,
-    rc: AsyncRedisClientDep,
+    notifier: NotifierDep,
     collection_id: Annotated[uuid.UUID, Path(...)],
 ) -> list[uuid.UUID]:
     """
@@ -111,19 +128,36 @@ async def delete_collection(
     ## Sync event
     Syncs user vault by notifying all
     connected devices via redis pubsub
-    with a delete event
+    with a batch of the collection delete event
+    & the ciphers soft delete event (ids)
 
     ## Client Expectation
     - Client should soft delete all ciphers in collection
     """
-    collection = await repo.collection.get(db, id=collection_id)
+    collection = await repo.collection.get_owned(db, id=collection_id, user_id=user.id)
     if not collection:
         raise EntityNotFoundException("Collection")
 
-    deleted_cipher_ids = await repo.cipher.soft_delete_collection(db, id=collection.id)
-    await repo.collection.delete(db, id=collection.id)
+    revision = await repo.user.bump_revision(db, user_id=user.id)
+    deleted_cipher_ids = await repo.cipher.soft_delete_collection(
+        db,
+        id=collection.id,
+        user_id=user.id,
+        revision=revision,
+    )
+    await repo.collection.delete(db, id=collection.id, user_id=user.id)
+
+    tombstone = schemas.TombstoneCreate(
+        id=collection.id,
+        user_id=user.id,
+        type=VaultEntity.COLLECTION,
+        revision=revision,
+    )
+    await repo.tombstone.create(db, obj_in=tombstone)
     await db.commit()
 
     collection = schemas.Collection.model_validate(collection)
-    await notify(rc, user_id=user.id, data=collection, action=Op.DELETE)
+    notifier.add(user_id=user.id, data=collection, action=Op.DELETE)
+    if deleted_cipher_ids:
+        notifier.add(user_id=user.id, data=deleted_cipher_ids, action=Op.SOFT_DELETE)
     return deleted_cipher_ids
@@ -0,0 +1,96 @@
+import uuid
+import zlib
+from collections.abc import AsyncIterator
+from typing import Annotated
+
+from fastapi import APIRouter, Query, status
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+from app import schemas
+from app.api.deps import UserDep
+from app.db import repos as repo
+from app.db.session import read_session
+from app.schemas.enums import VaultEntity
+
+router = APIRouter()
+
+CHUNK_SIZE = 64 * 1024  # bytes
+
+
+@router.get(
+    "/",
+    response_class=StreamingResponse,
+    responses={
+        status.HTTP_200_OK: {
+            "description": "Newline delimited JSON of the user collections & ciphers",
+            "content": {"application/x-ndjson": {}, "application/gzip": {}},
+        },
+    },
+)
+async def export_vault(
+    user: UserDep,
+    compress: Annotated[bool, Query(alias="gzip", description="Gzip the export")] = False,
+) -> StreamingResponse:
+    """
+    ## Export vault
+
+    ## Overview
+    * Streams the user collections then ciphers (including soft deleted)
+    * One JSON object per line: `{"type": "collection" | "cipher", "data": {...}}`
+    * Vault is streamed from a server side cursor, it is never loaded as a whole
+    """
+    chunks = _buffered(_export_lines(user.id))
+    filename = "vault.ndjson"
+    media_type = "application/x-ndjson"
+
+    if compress:
+        chunks = _gzipped(chunks)
+        filename += ".gz"
+        media_type = "application/gzip"
+
+    return StreamingResponse(
+        chunks,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+async def _export_lines(user_id: uuid.UUID) -> AsyncIterator[bytes]:
+    """
+    Yields the vault entities as NDJSON lines
+
+    The session is opened here rather than taken from DbDep
+    as dependencies are closed before the response is streamed.
+    Read from a replica if any.
+    """
+    async with read_session() as db:
+        async for collection in repo.collection.stream_all(db, user_id=user_id):
+            yield _line(VaultEntity.COLLECTION, schemas.Collection.model_validate(collection))
+        async for cipher in repo.cipher.stream_all(db, user_id=user_id):
+            yield _line(VaultEntity.CIPHER, schemas.Cipher.model_validate(cipher))
+
+
+def _line(type: VaultEntity, data: BaseModel) -> bytes:
+    return f'{{"type":"{type}","data":{data.model_dump_json()}}}\n'.encode()
+
+
+async def _buffered(chunks: AsyncIterator[bytes], size: int = CHUNK_SIZE) -> AsyncIterator[bytes]:
+    """Merges small chunks so that each write to the socket is at least size bytes"""
+    buffer = bytearray()
+    async for chunk in chunks:
+        buffer += chunk
+        if len(buffer) >= size:
+            yield bytes(buffer)
+            buffer.clear()
+    if buffer:
+        yield bytes(buffer)
+
+
+async def _gzipped(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """Gzip compresses a stream of chunks"""
+    compressor = zlib.compressobj(wbits=zlib.MAX_WBITS | 16)
+    async for chunk in chunks:
+        if compressed := compressor.compress(chunk):
+            yield compressed
+    yield compressor.flush()
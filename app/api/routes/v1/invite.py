@@ -143,7 +143,7 @@ async def setup_inviation(
     *,
     db: AsyncSession,
     mq: rq.Queue,
-    admin: models.User,
+    admin: schemas.Principal,
     invitee: models.User,
     expires_in_hours: int,
 ) -> schemas.WorkerJob:
@@ -184,7 +184,7 @@ async def setup_bulk_inviations(
     *,
     db: AsyncSession,
     mq: rq.Queue,
-    admin: models.User,
+    admin: schemas.Principal,
     invitees: list[models.User],
     expires_in_hours: int,
 ) -> None:
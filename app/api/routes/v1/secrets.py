@@ -1,46 +1,92 @@
 import uuid
 from typing import Annotated
 
-from fastapi import APIRouter, Body, Path
+from fastapi import APIRouter, Body, Path, Query, Request
+from sqlalchemy import Row
 from sqlalchemy.exc import IntegrityError
 
 from app import models, schemas
-from app.api.deps import DbDep, UserDep
-from app.api.deps.cache import AsyncRedisClientDep
+from app.api.deps import AcceptMediaTypeDep, DbDep, NotifierDep, ReadDbDep, UserDep
+from app.cache.decorators import cached_response
 from app.db import repos as repo
-from app.events import notify
-from app.schemas.enums import Op
+from app.schemas.enums import Op, VaultEntity
 from app.utils.exceptions import DuplicateEntityException, EntityNotFoundException
+from app.utils.responses import SchemaResponse, schema_response, validate_rows
 
 router = APIRouter()
 
 
-@router.get("/")
+@router.get("/", response_model=schemas.Page[schemas.Cipher])
 async def get_secrets(
-    db: DbDep,
+    db: ReadDbDep,
+    req: Request,
     user: UserDep,
-) -> list[schemas.Cipher]:
-    # TODO: Use pagination
-    ciphers = await repo.cipher._get_all(db, user_id=user.id)
-    return [schemas.Cipher.model_validate(cipher) for cipher in ciphers]
+    media_type: AcceptMediaTypeDep,
+    limit: Annotated[int, Query(gt=0, le=1000, description="Page size")] = 100,
+    cursor: Annotated[str | None, Query(description="Opaque cursor of the page")] = None,
+) -> SchemaResponse:
+    """
+    ## Get secrets page
+
+    ## Pagination
+    Keyset (cursor) pagination ordered by creation date.
+    Follow the `next` link (or send `next_cursor` as `cursor`)
+    to get the following page, it is null on the last page.
+
+    ## Count
+    Total count of secrets,
+    approximated for large vaults (`is_exact_count` is false)
+
+    ## Encoding
+    JSON by default, MessagePack with `Accept: application/msgpack`
+    (cipher data is sent as raw bytes)
+    """
+    page_cursor = schemas.Cursor.decode(cursor) if cursor else None
+
+    ciphers, next_cursor = await repo.cipher.get_page(
+        db,
+        limit=limit,
+        user_id=user.id,
+        cursor=page_cursor,
+    )
+    total = await repo.cipher.count(db, user_id=user.id)
 
+    next_token = next_cursor.encode() if next_cursor else None
+    next_link = str(req.url.include_query_params(cursor=next_token)) if next_token else None
 
-@router.get("/deleted")
+    page = schemas.Page[schemas.Cipher](
+        items=validate_rows(schemas.Cipher, ciphers),
+        count=total.count,
+        is_exact_count=total.is_exact,
+        next_cursor=next_token,
+        next=next_link,
+    )
+    return schema_response(page, type_=schemas.Page[schemas.Cipher], media_type=media_type)
+
+
+@router.get("/deleted", response_model=list[schemas.Cipher])
+@cached_response("deleted_secrets")
 async def get_deleted_secrets(
     db: DbDep,
     user: UserDep,
-) -> list[schemas.Cipher]:
+    media_type: AcceptMediaTypeDep,
+) -> SchemaResponse:
     ciphers = await repo.cipher._get_all_deleted(db, user_id=user.id)
-    return [schemas.Cipher.model_validate(cipher) for cipher in ciphers]
+    return schema_response(
+        validate_rows(schemas.Cipher, ciphers),
+        type_=list[schemas.Cipher],
+        media_type=media_type,
+    )
 
 
-@router.post("/")
+@router.post("/", response_model=schemas.Cipher)
 async def create_secret(
     db: DbDep,
     user: UserDep,
     new_cipher: Annotated[schemas.CipherCreate, Body(...)],
-    rc: AsyncRedisClientDep,
-) -> schemas.Cipher:
+    notifier: NotifierDep,
+    media_type: AcceptMediaTypeDep,
+) -> SchemaResponse:
     """
     ## Add new secret
 
@@ -50,30 +96,183 @@ async def create_secret(
     with a create event
     """
     try:
-        cipher = await repo.cipher.create(
-            db,
-            user_id=user.id,
-            obj_in=new_cipher,
-        )
+        cipher = await repo.cipher.create(db, user_id=user.id, obj_in=new_cipher)
         await db.commit()
-        await db.refresh(cipher)
     except IntegrityError:
         await db.rollback()
         raise DuplicateEntityException(models.Cipher)
 
     cipher = schemas.Cipher.model_validate(cipher)
-    await notify(rc, user_id=user.id, data=cipher, action=Op.CREATE)
-    return cipher
+    notifier.add(user_id=user.id, data=cipher, action=Op.CREATE)
+    return schema_response(cipher, type_=schemas.Cipher, media_type=media_type)
 
 
-@router.put("/{cipher_id}")
+@router.post("/bulk", response_model=schemas.CipherBulkWriteResult)
+async def bulk_write_secrets(
+    db: DbDep,
+    user: UserDep,
+    notifier: NotifierDep,
+    media_type: AcceptMediaTypeDep,
+    bulk_write: Annotated[schemas.CipherBulkWrite, Body(...)],
+) -> SchemaResponse:
+    """
+    ## Bulk create & update secrets (e.g. vault import)
+
+    ## Overview
+    * Writes all valid items in a single upsert statement
+    * Items referencing a missing secret or collection fail
+    without aborting the rest of the batch
+    * Returns a result per item, in the same order of the request
+
+    ## Sync event
+    Syncs user vault by notifying all
+    connected devices via redis pubsub
+    with a single upsert event of the written secrets ids
+    """
+    objs_in = [*bulk_write.create, *bulk_write.update]
+    collection_ids = {
+        obj.collection_id
+        for obj in objs_in
+        if obj.collection_id and "collection_id" in obj.model_fields_set
+    }
+    owned_collection_ids = await repo.collection.get_owned_ids(
+        db,
+        user_id=user.id,
+        ids=collection_ids,
+    )
+    # Locked till commit, so they can't be deleted before being updated
+    current_ciphers = await repo.cipher.get_summaries(
+        db,
+        user_id=user.id,
+        ids={obj.id for obj in bulk_write.update},
+        lock=True,
+    )
+
+    created, inserts = _plan_bulk_create(
+        bulk_write.create,
+        owned_collection_ids=owned_collection_ids,
+    )
+    updated, updates = _plan_bulk_update(
+        bulk_write.update,
+        current_ciphers=current_ciphers,
+        owned_collection_ids=owned_collection_ids,
+    )
+    upserts = [*inserts, *updates]
+    planned = [result for result in (*created, *updated) if result.error is None]
+    pending = dict(zip((upsert.id for upsert in upserts), planned, strict=True))
+
+    if upserts:
+        ciphers = await repo.cipher.bulk_upsert(
+            db,
+            user_id=user.id,
+            objs_in=upserts,
+            revision=await repo.user.bump_revision(db, user_id=user.id),
+        )
+        await db.commit()
+
+        for cipher in ciphers:
+            result = pending.pop(cipher.id)
+            result.ok = True
+            result.cipher = schemas.Cipher.model_validate(cipher)
+
+        if ciphers:
+            cipher_ids = [cipher.id for cipher in ciphers]
+            notifier.add(user_id=user.id, data=cipher_ids, action=Op.UPSERT)
+
+    # Id conflicts with ciphers of other users (see `bulk_upsert`)
+    for result in pending.values():
+        result.error = "Secret not found"
+
+    return schema_response(
+        schemas.CipherBulkWriteResult(create=created, update=updated),
+        type_=schemas.CipherBulkWriteResult,
+        media_type=media_type,
+    )
+
+
+def _plan_bulk_create(
+    creates: list[schemas.CipherCreate],
+    *,
+    owned_collection_ids: set[uuid.UUID],
+) -> tuple[list[schemas.CipherBulkResult], list[schemas.CipherUpsert]]:
+    """
+    Validate the bulk creates
+
+    Returns:
+        Result per create (invalid ones have their error set)
+        & upserts of the valid ones, in the same order
+    """
+    results: list[schemas.CipherBulkResult] = []
+    upserts: list[schemas.CipherUpsert] = []
+    for i, new_cipher in enumerate(creates):
+        result = schemas.CipherBulkResult(index=i)
+        results.append(result)
+
+        if new_cipher.collection_id and new_cipher.collection_id not in owned_collection_ids:
+            result.error = "Collection not found"
+            continue
+
+        upserts.append(schemas.CipherUpsert(id=uuid.uuid4(), **new_cipher.model_dump()))
+    return results, upserts
+
+
+def _plan_bulk_update(
+    updates: list[schemas.CipherBulkUpdate],
+    *,
+    current_ciphers: dict[uuid.UUID, Row],
+    owned_collection_ids: set[uuid.UUID],
+) -> tuple[list[schemas.CipherBulkResult], list[schemas.CipherUpsert]]:
+    """
+    Validate the bulk updates against the current secrets
+
+    Returns:
+        Result per update (invalid ones have their error set)
+        & upserts of the valid ones, in the same order
+    """
+    results: list[schemas.CipherBulkResult] = []
+    upserts: list[schemas.CipherUpsert] = []
+    updated_ids: set[uuid.UUID] = set()
+    for i, cipher_update in enumerate(updates):
+        result = schemas.CipherBulkResult(index=i)
+        results.append(result)
+
+        current = current_ciphers.get(cipher_update.id)
+        if not current:
+            result.error = "Secret not found"
+            continue
+
+        if cipher_update.id in updated_ids:
+            result.error = "Duplicate secret"
+            continue
+
+        collection_id = current.collection_id
+        if "collection_id" in cipher_update.model_fields_set:
+            collection_id = cipher_update.collection_id
+            if collection_id and collection_id not in owned_collection_ids:
+                result.error = "Collection not found"
+                continue
+
+        updated_ids.add(cipher_update.id)
+        upserts.append(
+            schemas.CipherUpsert(
+                id=cipher_update.id,
+                type=current.type,
+                data=cipher_update.data,
+                collection_id=collection_id,
+            )
+        )
+    return results, upserts
+
+
+@router.put("/{cipher_id}", response_model=schemas.Cipher)
 async def update_secret(
     db: DbDep,
     user: UserDep,
-    rc: AsyncRedisClientDep,
+    notifier: NotifierDep,
     cipher_id: Annotated[uuid.UUID, Path(...)],
     cipher_update: Annotated[schemas.CipherUpdate, Body(...)],
-) -> schemas.Cipher:
+    media_type: AcceptMediaTypeDep,
+) -> SchemaResponse:
     """
     ## Update existing secret
 
@@ -82,26 +281,24 @@ async def update_secret(
     connected devices via redis pubsub
     with an update event
     """
-    cipher = await repo.cipher.get(db, id=cipher_id)
+    cipher = await repo.cipher.update(db, id=cipher_id, user_id=user.id, obj_in=cipher_update)
     if not cipher:
         raise EntityNotFoundException("Secret")
-
-    cipher.import_from(cipher_update)
     await db.commit()
-    await db.refresh(cipher)
 
     secret = schemas.Cipher.model_validate(cipher)
-    await notify(rc, user_id=user.id, data=secret, action=Op.UPDATE)
-    return secret
+    notifier.add(user_id=user.id, data=secret, action=Op.UPDATE)
+    return schema_response(secret, type_=schemas.Cipher, media_type=media_type)
 
 
-@router.put("/restore/{cipher_id}")
+@router.put("/restore/{cipher_id}", response_model=schemas.Cipher)
 async def restore_secret(
     db: DbDep,
     user: UserDep,
-    rc: AsyncRedisClientDep,
+    notifier: NotifierDep,
     cipher_id: Annotated[uuid.UUID, Path(...)],
-) -> schemas.Cipher:
+    media_type: AcceptMediaTypeDep,
+) -> SchemaResponse:
     """
     ## Restore soft deleted secret
 
@@ -110,24 +307,24 @@ async def restore_secret(
     connected devices via redis pubsub
     with a restore event
     """
-    cipher = await repo.cipher.restore(db, id=cipher_id)
+    cipher = await repo.cipher.restore(db, id=cipher_id, user_id=user.id)
     if not cipher:
         raise EntityNotFoundException("Secret")
     await db.commit()
-    await db.refresh(cipher)
 
     secret = schemas.Cipher.model_validate(cipher)
-    await notify(rc, user_id=user.id, data=secret, action=Op.RESTORE)
-    return secret
+    notifier.add(user_id=user.id, data=secret, action=Op.RESTORE)
+    return schema_response(secret, type_=schemas.Cipher, media_type=media_type)
 
 
-@router.delete("/{cipher_id}")
+@router.delete("/{cipher_id}", response_model=schemas.Cipher)
 async def soft_delete_secret(
     db: DbDep,
     user: UserDep,
-    rc: AsyncRedisClientDep,
+    notifier: NotifierDep,
     cipher_id: Annotated[uuid.UUID, Path(...)],
-) -> schemas.Cipher:
+    media_type: AcceptMediaTypeDep,
+) -> SchemaResponse:
     """
     ## Delete existing secret
 
@@ -136,21 +333,21 @@ async def soft_delete_secret(
     connected devices via redis pubsub
     with a soft delete event
     """
-    cipher = await repo.cipher.soft_delete(db, id=cipher_id)
+    cipher = await repo.cipher.soft_delete(db, id=cipher_id, user_id=user.id)
     if not cipher:
         raise EntityNotFoundException("Secret")
     await db.commit()
-    await db.refresh(cipher)
 
     secret = schemas.Cipher.model_validate(cipher)
-    await notify(rc, user_id=user.id, data=secret, action=Op.SOFT_DELETE)
-    return secret
+    notifier.add(user_id=user.id, data=secret, action=Op.SOFT_DELETE)
+    return schema_response(secret, type_=schemas.Cipher, media_type=media_type)
+
 
 @router.delete("/{cipher_id}/permanent")
 async def permanently_delete_secret(
     db: DbDep,
     user: UserDep,
-    rc: AsyncRedisClientDep,
+    notifier: NotifierDep,
     cipher_id: Annotated[uuid.UUID, Path(...)],
 ) -> None:
     """
@@ -161,8 +358,16 @@ async def permanently_delete_secret(
     connected devices via redis pubsub
     with a delete event
     """
-    has_deleted = await repo.cipher.permanent_delete(db, id=cipher_id)
+    has_deleted = await repo.cipher.permanent_delete(db, id=cipher_id, user_id=user.id)
     if not has_deleted:
         raise EntityNotFoundException("Secret")
+
+    tombstone = schemas.TombstoneCreate(
+        id=cipher_id,
+        user_id=user.id,
+        type=VaultEntity.CIPHER,
+        revision=await repo.user.bump_revision(db, user_id=user.id),
+    )
+    await repo.tombstone.create(db, obj_in=tombstone)
     await db.commit()
-    await notify(rc, user_id=user.id, data=cipher_id, action=Op.DELETE)
+    notifier.add(user_id=user.id, data=cipher_id, action=Op.DELETE)
@@ -1,8 +1,46 @@
-from fastapi import APIRouter
+import asyncio
+import json
+import uuid
+from collections.abc import AsyncGenerator
+from typing import Annotated
+
+from fastapi import (
+    APIRouter,
+    Header,
+    HTTPException,
+    Query,
+    WebSocket,
+    WebSocketDisconnect,
+    status,
+)
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession
 from sse_starlette import EventSourceResponse
+from starlette.background import BackgroundTask
+from starlette.websockets import WebSocketState
 
-from app.api.deps import AsyncRedisClientDep, UserDep
+from app import cache, schemas
+from app.api.deps import (
+    AcceptMediaTypeDep,
+    AsyncRedisClientDep,
+    ReadDbDep,
+    ReqIpDep,
+    UserDep,
+)
+from app.api.deps.auth import AccessTokenCookieDep, DeviceIDCookieDep, get_current_user
+from app.cache.client import AsyncRedisClient
+from app.core.config import settings
+from app.db import repos as repo
+from app.db.session import (
+    AsyncSessionFactory,
+    read_from_primary,
+    read_session,
+    reads_from_replica,
+)
 from app.events import SyncData, listen
+from app.utils.coders import MsgPackCoder
+from app.utils.exceptions import TooManyRequestsException
+from app.utils.responses import SchemaResponse, schema_response, validate_rows
 
 router = APIRouter()
 
@@ -11,6 +49,277 @@ router = APIRouter()
 async def sse(
     user: UserDep,
     rc: AsyncRedisClientDep,
+    last_event_id: Annotated[str | None, Header(description="Last received event id")] = None,
 ) -> EventSourceResponse:
-    """Server sent events for vault syncing"""
-    return EventSourceResponse(listen(rc, user_id=user.id))
+    """
+    Server sent events for vault syncing
+
+    ## Resume
+    When the sync stream is enabled, events have an id.
+    On reconnect (`Last-Event-ID` header), the events missed since are replayed first.
+    If they can't be, a `reset` event is sent &
+    client should sync the changes it missed (see `/changes`)
+
+    ## Connection
+    * Pings are sent periodically to keep the connection alive
+    * The stream is closed if the client can't keep up with the changes
+    or after a max lifetime, client should reconnect & resume
+    * Concurrent streams per user are limited (429 if exceeded)
+    """
+    lease = await cache.leases.acquire(
+        rc,
+        key=cache.keys.sync_vault_leases(user.id),
+        limit=settings.SYNC_SSE_MAX_PER_USER,
+        ttl=settings.SYNC_SSE_LEASE_TTL_SECONDS,
+    )
+    if not lease:
+        raise TooManyRequestsException(
+            "Too many sync streams",
+            retry_after=settings.SYNC_SSE_LEASE_TTL_SECONDS,
+        )
+
+    return EventSourceResponse(
+        listen(
+            rc,
+            user_id=user.id,
+            last_event_id=last_event_id,
+            lease=lease,
+            max_lifetime=settings.SYNC_SSE_MAX_LIFETIME_SECONDS,
+        ),
+        ping=settings.SYNC_SSE_PING_SECONDS,
+        send_timeout=settings.SYNC_SSE_SEND_TIMEOUT_SECONDS,
+        # Released by the stream once done, or here if it is never iterated
+        background=BackgroundTask(cache.leases.release, rc, lease=lease),
+    )
+
+
+@router.get("/changes", response_model=schemas.VaultChanges)
+async def get_changes(
+    db: ReadDbDep,
+    user: UserDep,
+    media_type: AcceptMediaTypeDep,
+    since: Annotated[int, Query(ge=0, description="Last synced vault revision")] = 0,
+) -> SchemaResponse:
+    """
+    ## Vault changes since a revision
+
+    ## Overview
+    * Returns ciphers (including soft deleted) & collections changed after `since`
+    * Returns tombstones of permanently deleted ciphers & collections (delta sync only)
+    * Returns the current vault revision to be sent as `since` on the next sync
+
+    ## Client Expectation
+    - Client should store the returned revision after applying the changes
+    - If `is_full` is true, client should replace its local vault copy
+    (`since` is 0 or ahead of the server vault revision)
+
+    ## Encoding
+    JSON by default, MessagePack with `Accept: application/msgpack`
+    (cipher data is sent as raw bytes)
+    """
+    changes = await get_vault_changes(db, user_id=user.id, since=since)
+    return schema_response(changes, type_=schemas.VaultChanges, media_type=media_type)
+
+
+@router.websocket("/ws")
+async def ws_sync(
+    ws: WebSocket,
+    rc: AsyncRedisClientDep,
+    req_ip: ReqIpDep,
+    req_device_id: DeviceIDCookieDep = None,
+    token: AccessTokenCookieDep = None,
+) -> None:
+    """
+    WebSocket for vault syncing
+
+    Carries the same events as the server sent events,
+    and the vault changes on request, over a single socket.
+
+    ## Encoding
+    All messages are binary, encoded with MessagePack
+
+    ## Server messages
+    * `{"type": "event", "id": str | None, "data": SyncData}`
+    * `{"type": "reset"}` missed events can't be replayed, client should request changes
+    * `{"type": "changes", "data": VaultChanges}`
+    * `{"type": "ack", "revision": int}`
+    * `{"type": "error", "detail": str}`
+
+    ## Client messages
+    * `{"type": "ack", "revision": int}` changes up to revision were applied
+    * `{"type": "changes", "since": int | None}` request the vault changes
+    since a revision (defaults to the last acknowledged one)
+
+    ## Connection
+    Closed with 1008 (policy violation) if not authenticated,
+    1013 (try again later) if the user has too many sync streams
+    or 1003 (unsupported data) on a text message
+    """
+    try:
+        async with AsyncSessionFactory() as db:
+            user = await get_current_user(
+                rc=rc,
+                db=db,
+                req_ip=req_ip,
+                req_device_id=req_device_id,
+                token=token,
+            )
+    except HTTPException:
+        await ws.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    lease = await cache.leases.acquire(
+        rc,
+        key=cache.keys.sync_vault_leases(user.id),
+        limit=settings.SYNC_SSE_MAX_PER_USER,
+        ttl=settings.SYNC_SSE_LEASE_TTL_SECONDS,
+    )
+    if not lease:
+        await ws.close(code=status.WS_1013_TRY_AGAIN_LATER)
+        return
+
+    try:
+        await ws.accept()
+        socket = SyncSocket(ws, rc=rc, user_id=user.id)
+        events = listen(
+            rc,
+            user_id=user.id,
+            lease=lease,
+            max_lifetime=settings.SYNC_SSE_MAX_LIFETIME_SECONDS,
+            transport="ws",
+        )
+        await socket.serve(events)
+    finally:
+        # Released by the listener once done, or here if it never started
+        await cache.leases.release(rc, lease=lease)
+
+
+class SyncSocket:
+    """Vault syncing over an accepted websocket"""
+
+    def __init__(self, ws: WebSocket, *, rc: AsyncRedisClient, user_id: uuid.UUID) -> None:
+        self.ws = ws
+        self.rc = rc
+        self.user_id = user_id
+        self.acked_revision = 0
+        self._send_lock = asyncio.Lock()
+
+    async def serve(self, events: AsyncGenerator[dict, None]) -> None:
+        """Forward events & answer client messages till either side is done"""
+        tasks = {
+            asyncio.create_task(self._forward(events)),
+            asyncio.create_task(self._receive()),
+        }
+        try:
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await events.aclose()
+
+        for task in done:
+            try:
+                task.result()
+            except (WebSocketDisconnect, OSError, RuntimeError):
+                # Client disconnected (or socket closed) while sending
+                return
+
+        await self.close()
+
+    async def send(self, message: dict) -> None:
+        async with self._send_lock:
+            await self.ws.send_bytes(MsgPackCoder.encode(message))
+
+    async def close(self, code: int = status.WS_1000_NORMAL_CLOSURE) -> None:
+        """Close the socket unless either side already did"""
+        async with self._send_lock:
+            if (
+                self.ws.client_state == WebSocketState.CONNECTED
+                and self.ws.application_state == WebSocketState.CONNECTED
+            ):
+                await self.ws.close(code=code)
+
+    async def _forward(self, events: AsyncGenerator[dict, None]) -> None:
+        async for event in events:
+            if event.get("event") == "reset":
+                await self.send({"type": "reset"})
+            else:
+                data = json.loads(event["data"])
+                await self.send({"type": "event", "id": event.get("id"), "data": data})
+
+    async def _receive(self) -> None:
+        try:
+            while True:
+                try:
+                    raw = await self.ws.receive_bytes()
+                except KeyError:
+                    # Text frame, only binary messages are supported
+                    await self.close(status.WS_1003_UNSUPPORTED_DATA)
+                    return
+                try:
+                    message = sync_client_message.validate_python(MsgPackCoder.decode(raw))
+                except (ValueError, TypeError):
+                    await self.send({"type": "error", "detail": "Invalid message"})
+                    continue
+                await self._handle(message)
+        except WebSocketDisconnect:
+            return
+
+    async def _handle(self, message: schemas.SyncClientMessage) -> None:
+        if isinstance(message, schemas.SyncAck):
+            self.acked_revision = message.revision
+            await self.send({"type": "ack", "revision": message.revision})
+            return
+
+        since = self.acked_revision if message.since is None else message.since
+        async with read_session() as db:
+            changes = await get_vault_changes(db, user_id=self.user_id, since=since)
+        await self.send({"type": "changes", "data": changes.model_dump(mode="json")})
+
+
+sync_client_message = TypeAdapter(schemas.SyncClientMessage)
+
+
+async def get_vault_changes(
+    db: AsyncSession,
+    *,
+    user_id: uuid.UUID,
+    since: int,
+) -> schemas.VaultChanges:
+    """
+    Get user vault changes since a revision (see `get_changes`)
+
+    A replica vault revision below `since` means the replica is behind the client
+    (it synced from the primary or a replica ahead), the changes are then read from the primary.
+    A full vault copy is only sent if the primary is behind the client too.
+    """
+    revision = await repo.user.get_revision(db, user_id=user_id)
+    if since > revision and reads_from_replica(db):
+        read_from_primary(db)
+        revision = await repo.user.get_revision(db, user_id=user_id)
+
+    is_full = since == 0 or since > revision
+    if is_full:
+        since = 0
+
+    ciphers = await repo.cipher.get_changed(db, user_id=user_id, since=since, until=revision)
+    collections = await repo.collection.get_changed(
+        db,
+        user_id=user_id,
+        since=since,
+        until=revision,
+    )
+    tombstones = (
+        []
+        if is_full
+        else await repo.tombstone.get_changed(db, user_id=user_id, since=since, until=revision)
+    )
+
+    return schemas.VaultChanges(
+        revision=revision,
+        is_full=is_full,
+        ciphers=validate_rows(schemas.Cipher, ciphers),
+        collections=validate_rows(schemas.Collection, collections),
+        tombstones=validate_rows(schemas.Tombstone, tombstones),
+    )
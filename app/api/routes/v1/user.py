@@ -1,3 +1,32 @@
-from fastapi import APIRouter
+import uuid
+from typing import Annotated
+
+from fastapi import APIRouter, Path, status
+
+from app.api.deps import AdminDep, AsyncRedisClientDep
+from app.api.routes.v1.auth import revoke_sessions
 
 router = APIRouter()
+
+
+@router.post(
+    "/{user_id}/sessions/revoke",
+    status_code=status.HTTP_200_OK,
+)
+async def revoke_user_sessions(
+    admin: AdminDep,
+    rc: AsyncRedisClientDep,
+    user_id: Annotated[uuid.UUID, Path(...)],
+) -> list[str]:
+    """
+    ## Revoke all sessions of a user
+
+    ## Overview
+    * Deletes all refresh token claims & cached principals of the user from redis
+    * Takes effect immediately, as authenticated requests require the cached refresh token claim
+    * The user has to login again on all devices
+
+    Returns:
+        list[str]: Ids of the devices whose sessions were revoked
+    """
+    return await revoke_sessions(rc, user_id=user_id)
@@ -1,2 +1,2 @@
 from . import keys
-from .service import tokens
+from .service import leases, principals, rate_limits, responses, tokens
@@ -0,0 +1,45 @@
+"""
+This module is used to backfill redis indexes with the keys cached before they existed.
+It is called from the Dockerfile as part of the entrypoint.
+"""
+
+import asyncio
+import logging
+
+from app import cache
+from app.cache.client import AsyncRedisClient
+from app.core.config import settings
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+async def backfill_refresh_tokens_index(rc: AsyncRedisClient) -> None:
+    """
+    Index the refresh tokens issued before the per user index existed (once),
+    so revoking all sessions of a user only reads the index
+    """
+    marker = cache.keys.refresh_tokens_index_backfilled()
+    if await rc.exists(marker):
+        logger.info("Refresh tokens index already backfilled")
+        return
+
+    indexed = await cache.tokens.backfill_index(
+        rc,
+        match=cache.keys.refresh_token("*", "*"),
+        # rt:user:{user_id}:device:{device_id}
+        index_key=lambda key: cache.keys.refresh_tokens_index(key.split(":")[2]),
+        ttl=settings.REFRESH_TOKEN_EXPIRE_SECONDS,
+    )
+    await rc.set(marker, 1)
+    logger.info("Indexed %d refresh tokens", indexed)
+
+
+async def main() -> None:
+    logger.info("--- Backfilling redis indexes ---")
+    await backfill_refresh_tokens_index(AsyncRedisClient())
+    logger.info("--- Redis indexes backfilled ---")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
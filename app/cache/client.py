@@ -1,13 +1,37 @@
 import redis.asyncio as aioredis
+from redis.asyncio.client import Pipeline
 
+from app.core import metrics
 from app.core.config import settings
 
 async_redis_pool = aioredis.ConnectionPool.from_url(str(settings.REDIS_URI))
 
 
+class InstrumentedPipeline(Pipeline):
+    """Pipeline recording its execution latency (as a single PIPELINE command)"""
+
+    async def execute(self, raise_on_error: bool = True):
+        with metrics.REDIS_COMMAND_SECONDS.labels("PIPELINE").time():
+            return await super().execute(raise_on_error)
+
+
 class AsyncRedisClient(aioredis.Redis):
     def __init__(self):
         super().__init__(
             connection_pool=async_redis_pool,
             decode_responses=True,
         )
+
+    async def execute_command(self, *args, **options):
+        """Execute command, recording its latency"""
+        command = args[0].decode() if isinstance(args[0], bytes) else str(args[0])
+        with metrics.REDIS_COMMAND_SECONDS.labels(command.upper()).time():
+            return await super().execute_command(*args, **options)
+
+    def pipeline(self, transaction: bool = True, shard_hint: str | None = None) -> Pipeline:
+        return InstrumentedPipeline(
+            self.connection_pool,
+            self.response_callbacks,
+            transaction,
+            shard_hint,
+        )
@@ -0,0 +1,61 @@
+import functools
+from collections.abc import Awaitable, Callable
+
+from starlette.responses import Response
+
+from app.cache.client import AsyncRedisClient
+from app.cache.service import responses
+from app.utils.responses import JSON_MEDIA_TYPE
+
+
+def cached_response[**P](
+    name: str,
+) -> Callable[[Callable[P, Awaitable[Response]]], Callable[P, Awaitable[Response]]]:
+    """
+    Caches the rendered response of a user endpoint in redis (see `ResponsesService`)
+
+    The endpoint must depend on the requesting `user`
+    & return a rendered response (e.g. `SchemaResponse`).
+    Responses are cached per negotiated `media_type` if the endpoint depends on it
+    (see `AcceptMediaTypeDep`), cached responses are returned as is.
+
+    The endpoint must read from the primary (`DbDep`, not `ReadDbDep`):
+    the generation guard only holds if the read sees the writes invalidating the cache,
+    a lagging replica could cache a stale response till the next write.
+
+    Usage:
+        @router.get("/", response_model=list[schemas.Collection])
+        @cached_response("collections")
+        async def get_collections(
+            db: DbDep,
+            user: UserDep,
+            media_type: AcceptMediaTypeDep,
+        ) -> SchemaResponse:
+            ...
+    """
+
+    def decorator(endpoint: Callable[P, Awaitable[Response]]) -> Callable[P, Awaitable[Response]]:
+        @functools.wraps(endpoint)
+        async def wrapper(*args: P.args, **kwargs: P.kwargs) -> Response:
+            user_id = kwargs["user"].id  # type: ignore
+            media_type: str = kwargs.get("media_type") or JSON_MEDIA_TYPE  # type: ignore
+            field = f"{name}:{media_type}"
+            rc = AsyncRedisClient()
+
+            cached, generation = await responses.get(rc, user_id=user_id, name=field)
+            if cached is not None:
+                return Response(cached, media_type=media_type, headers={"Vary": "Accept"})
+
+            response = await endpoint(*args, **kwargs)
+            await responses.save(
+                rc,
+                user_id=user_id,
+                name=field,
+                response=response.body,
+                generation=generation,
+            )
+            return response
+
+        return wrapper
+
+    return decorator
@@ -3,10 +3,45 @@ def refresh_token(user_id, device_id):
     return f"rt:user:{user_id}:device:{device_id}"
 
 
+# set (of refresh token keys)
+def refresh_tokens_index(user_id):
+    return f"rt:user:{user_id}:index"
+
+
+# str (set once the refresh tokens issued before the index are indexed)
+def refresh_tokens_index_backfilled():
+    return "rt:index:backfilled"
+
+
 def otp_shash_token(user_id):
     return f"otp:shash:{user_id}"
 
 
+# hash
+def principal(user_id):
+    return f"principal:user:{user_id}"
+
+
+# hash (name -> response)
+def responses(user_id):
+    return f"cache:user:{user_id}"
+
+
+# hash (window -> hits)
+def rate_limit(scope, identity):
+    return f"rl:{scope}:{identity}"
+
+
+# sorted set
+def sync_vault_leases(user_id):
+    return f"sync:v:leases:{user_id}"
+
+
 # pubsub
 def sync_vault_pubsub(user_id):
     return f"sync:v:{user_id}"
+
+
+# stream
+def sync_vault_stream(user_id):
+    return f"sync:v:stream:{user_id}"
@@ -1 +1,5 @@
+from .leases import Lease, leases
+from .principals import principals
+from .rate_limits import RateLimit, rate_limits
+from .responses import responses
 from .tokens import tokens
@@ -0,0 +1,71 @@
+import uuid
+from dataclasses import dataclass, field
+
+from app.cache.client import AsyncRedisClient
+
+# KEYS: leases
+# ARGV: lease id, ttl, limit
+ACQUIRE_LUA = """
+local now = tonumber(redis.call('TIME')[1])
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now)
+if redis.call('ZCARD', KEYS[1]) >= tonumber(ARGV[3]) then
+    return 0
+end
+redis.call('ZADD', KEYS[1], now + tonumber(ARGV[2]), ARGV[1])
+redis.call('EXPIRE', KEYS[1], ARGV[2])
+return 1
+"""
+
+# KEYS: leases
+# ARGV: lease id, ttl
+RENEW_LUA = """
+local now = tonumber(redis.call('TIME')[1])
+redis.call('ZADD', KEYS[1], now + tonumber(ARGV[2]), ARGV[1])
+redis.call('EXPIRE', KEYS[1], ARGV[2])
+return 1
+"""
+
+
+@dataclass(frozen=True)
+class Lease:
+    key: str
+    ttl: int
+    id: str = field(default_factory=lambda: str(uuid.uuid4()))
+
+
+class LeasesService:
+    """
+    Limit the number of concurrently held leases of a resource
+    (e.g. open connections of a user).
+
+    Leases are stored in a sorted set scored by their expiry,
+    so leases of crashed holders expire unless renewed.
+    """
+
+    def __init__(self) -> None:
+        client = AsyncRedisClient()
+        self._acquire_script = client.register_script(ACQUIRE_LUA)
+        self._renew_script = client.register_script(RENEW_LUA)
+
+    async def acquire(
+        self,
+        rc: AsyncRedisClient,
+        *,
+        key: str,
+        limit: int,
+        ttl: int,
+    ) -> Lease | None:
+        """Acquire a lease for ttl seconds, None if limit leases are already held"""
+        lease = Lease(key=key, ttl=ttl)
+        acquired = await self._acquire_script(keys=[key], args=[lease.id, ttl, limit], client=rc)
+        return lease if acquired else None
+
+    async def renew(self, rc: AsyncRedisClient, *, lease: Lease) -> None:
+        """Extend the lease for another ttl seconds"""
+        await self._renew_script(keys=[lease.key], args=[lease.id, lease.ttl], client=rc)
+
+    async def release(self, rc: AsyncRedisClient, *, lease: Lease) -> None:
+        await rc.zrem(lease.key, lease.id)
+
+
+leases = LeasesService()
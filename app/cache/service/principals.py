@@ -0,0 +1,78 @@
+import json
+import time
+import uuid
+
+from app.cache import keys
+from app.cache.client import AsyncRedisClient
+from app.core.config import settings
+from app.schemas import Principal
+
+
+class PrincipalsService:
+    """
+    Short lived cache of the principals of user device sessions.
+
+    All principals of a user are stored in a single hash (device id -> principal),
+    so they can be invalidated per device or all at once.
+    Each principal carries its own expiry, since the hash ttl
+    is extended whenever a principal of another device is cached.
+    """
+
+    async def save(
+        self,
+        rc: AsyncRedisClient,
+        *,
+        device_id: str,
+        principal: Principal,
+        ttl: int | None = None,
+    ) -> None:
+        """Cache principal of the user device session for ttl seconds"""
+        ttl = ttl or settings.PRINCIPAL_CACHE_TTL_SECONDS
+        key = keys.principal(principal.id)
+        value = json.dumps(
+            {
+                "exp": int(time.time()) + ttl,
+                "principal": principal.model_dump(mode="json"),
+            }
+        )
+        async with rc.pipeline(transaction=False) as pipe:
+            pipe.hset(key, device_id, value)
+            pipe.expire(key, ttl)
+            await pipe.execute()
+
+    async def get(
+        self,
+        rc: AsyncRedisClient,
+        *,
+        user_id: uuid.UUID | str,
+        device_id: str,
+    ) -> Principal | None:
+        """Get cached principal of the user device session or None if missing or expired"""
+        value = await rc.hget(keys.principal(user_id), device_id)
+        if not value:
+            return None
+        cached = json.loads(value)
+        if cached["exp"] <= time.time():
+            return None
+        return Principal.model_validate(cached["principal"])
+
+    async def invalidate(
+        self,
+        rc: AsyncRedisClient,
+        *,
+        user_id: uuid.UUID | str,
+        device_id: str | None = None,
+    ) -> None:
+        """
+        Invalidate cached principal of the user device session,
+        or all user principals if no device is given
+        (e.g. on user deactivation or password change)
+        """
+        key = keys.principal(user_id)
+        if device_id:
+            await rc.hdel(key, device_id)
+        else:
+            await rc.unlink(key)
+
+
+principals = PrincipalsService()
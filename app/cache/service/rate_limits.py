@@ -0,0 +1,76 @@
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+from app.cache.client import AsyncRedisClient
+
+# KEYS: counters (one hash per limited identity: window index -> hits)
+# ARGV: limit & window (seconds) of each counter
+HIT_LUA = """
+local time = redis.call('TIME')
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+local retry_after = 0
+local windows = {}
+for i, key in ipairs(KEYS) do
+    local limit = tonumber(ARGV[2 * i - 1])
+    local window = tonumber(ARGV[2 * i]) * 1000
+    local current = math.floor(now / window)
+    local elapsed = (now % window) / window
+    local hits = redis.call('HMGET', key, current - 1, current)
+    local estimate = (tonumber(hits[1]) or 0) * (1 - elapsed) + (tonumber(hits[2]) or 0)
+    if estimate >= limit then
+        retry_after = math.max(retry_after, math.ceil((window - now % window) / 1000))
+    end
+    windows[i] = current
+end
+if retry_after > 0 then
+    return retry_after
+end
+for i, key in ipairs(KEYS) do
+    redis.call('HINCRBY', key, windows[i], 1)
+    redis.call('HDEL', key, windows[i] - 2)
+    redis.call('EXPIRE', key, 2 * tonumber(ARGV[2 * i]))
+end
+return 0
+"""
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    key: str
+    limit: int
+    window: int
+
+
+class RateLimitsService:
+    """
+    Sliding window rate limits.
+
+    Each limited identity (e.g. an ip or an account) has a counter of hits per fixed window.
+    The hits of the sliding window are estimated from the current window hits
+    & the previous window hits weighted by its overlap with the sliding window.
+    """
+
+    def __init__(self) -> None:
+        self._hit_script = AsyncRedisClient().register_script(HIT_LUA)
+
+    async def hit(self, rc: AsyncRedisClient, *, limits: Sequence[RateLimit]) -> int:
+        """
+        Count a hit against all limits at once (single script call).
+        Rejected hits are not counted.
+
+        Returns:
+            int: 0 if no limit is exceeded,
+                else seconds to wait before retrying
+        """
+        if not limits:
+            return 0
+        args = [arg for limit in limits for arg in (limit.limit, limit.window)]
+        retry_after = await self._hit_script(
+            keys=[limit.key for limit in limits],
+            args=args,
+            client=rc,
+        )
+        return int(retry_after)
+
+
+rate_limits = RateLimitsService()
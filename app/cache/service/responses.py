@@ -0,0 +1,81 @@
+import uuid
+
+from app.cache import keys
+from app.cache.client import AsyncRedisClient
+from app.core.config import settings
+
+GENERATION_FIELD = "_gen"
+
+# KEYS: responses
+# ARGV: generation read before loading the response, name, response, ttl
+SAVE_LUA = """
+local generation = redis.call('HGET', KEYS[1], '_gen') or ''
+if generation ~= ARGV[1] then
+    return 0
+end
+redis.call('HSET', KEYS[1], ARGV[2], ARGV[3])
+redis.call('EXPIRE', KEYS[1], ARGV[4])
+return 1
+"""
+
+
+class ResponsesService:
+    """
+    Cache of the serialized responses of a user (e.g. its collections).
+
+    All responses of a user are stored in a single hash (name -> response),
+    so they are invalidated at once whenever the user vault changes.
+
+    Invalidation starts a new generation of the hash, a response is only saved
+    if no invalidation happened since it was loaded (it would be stale already).
+    """
+
+    def __init__(self) -> None:
+        self._save_script = AsyncRedisClient().register_script(SAVE_LUA)
+
+    async def get(
+        self,
+        rc: AsyncRedisClient,
+        *,
+        user_id: uuid.UUID,
+        name: str,
+    ) -> tuple[str | bytes | None, str]:
+        """
+        Returns:
+            (cached response or None, current generation to save the response with)
+        """
+        response, generation = await rc.hmget(keys.responses(user_id), name, GENERATION_FIELD)
+        if isinstance(generation, bytes):
+            generation = generation.decode()
+        return response, generation or ""
+
+    async def save(
+        self,
+        rc: AsyncRedisClient,
+        *,
+        user_id: uuid.UUID,
+        name: str,
+        response: bytes,
+        generation: str,
+        ttl: int | None = None,
+    ) -> bool:
+        """Cache response for ttl seconds if the generation is still current"""
+        ttl = ttl or settings.RESPONSE_CACHE_TTL_SECONDS
+        saved = await self._save_script(
+            keys=[keys.responses(user_id)],
+            args=[generation, name, response, ttl],
+            client=rc,
+        )
+        return bool(saved)
+
+    async def invalidate(self, rc: AsyncRedisClient, *, user_id: uuid.UUID) -> None:
+        """Drop all cached responses of the user"""
+        key = keys.responses(user_id)
+        async with rc.pipeline(transaction=True) as pipe:
+            pipe.unlink(key)
+            pipe.hset(key, GENERATION_FIELD, uuid.uuid4().hex)
+            pipe.expire(key, settings.RESPONSE_CACHE_TTL_SECONDS)
+            await pipe.execute()
+
+
+responses = ResponsesService()
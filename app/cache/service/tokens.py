@@ -1,9 +1,48 @@
+import uuid
+from collections.abc import Callable
+
+from pydantic import IPvAnyAddress
+
 from app.cache.client import AsyncRedisClient
 from app.core.config import settings
 from app.schemas import OTPSaltedHashClaim, RefreshTokenClaim, TokenBase
 
+# KEYS: token
+# ARGV: expected jti, expected ip, new token claim
+ROTATE_LUA = """
+local current = redis.call('GET', KEYS[1])
+if not current then
+    return 0
+end
+local claim = cjson.decode(current)
+if claim['jti'] ~= ARGV[1] or claim['ip'] ~= ARGV[2] then
+    return 0
+end
+redis.call('SET', KEYS[1], ARGV[3], 'KEEPTTL')
+return 1
+"""
+
+# KEYS: tokens index, extra keys to unlink
+# Unlinks the indexed keys which are not declared in KEYS,
+# so it assumes a single redis node (not safe on redis cluster)
+REVOKE_ALL_LUA = """
+local revoked = {}
+for _, key in ipairs(redis.call('SMEMBERS', KEYS[1])) do
+    if redis.call('UNLINK', key) == 1 then
+        table.insert(revoked, key)
+    end
+end
+redis.call('UNLINK', unpack(KEYS))
+return revoked
+"""
+
 
 class TokensService:
+    def __init__(self) -> None:
+        client = AsyncRedisClient()
+        self._rotate_script = client.register_script(ROTATE_LUA)
+        self._revoke_all_script = client.register_script(REVOKE_ALL_LUA)
+
     async def save(
         self,
         rc: AsyncRedisClient,
@@ -12,6 +51,7 @@ class TokensService:
         token_claim: TokenBase,
         keep_ttl: bool = False,
         ttl: int | None = None,
+        index_key: str | None = None,
     ) -> bool:
         """
         Cache token claim.
@@ -21,11 +61,27 @@ class TokensService:
         If the keep_ttl is set to True, the ttl is not changed when the token is updated.
         However if the token is not found in the cache, the ttl is set to the token's ttl.
 
+        If index_key is given, the token key is added to the index set
+        (e.g. all refresh tokens of a user) to be revoked at once (see `revoke_all`).
+
         Returns:
             int: ttl of the token.
         """
         value = token_claim.model_dump_json()
 
+        if index_key:
+            ttl = ttl or self._get_token_type_ttl(type(token_claim))
+            async with rc.pipeline(transaction=True) as pipe:
+                if keep_ttl:
+                    pipe.set(key, value, xx=True, keepttl=True)
+                    pipe.set(key, value, nx=True, ex=ttl)
+                else:
+                    pipe.set(key, value, ex=ttl)
+                pipe.sadd(index_key, key)
+                pipe.expire(index_key, ttl)
+                results = await pipe.execute()
+            return any(results[:-2])
+
         if keep_ttl:
             exists = await rc.set(
                 key,
@@ -39,6 +95,92 @@ class TokensService:
         ttl = ttl or self._get_token_type_ttl(type(token_claim))
         return await rc.set(key, value, ex=ttl)
 
+    async def rotate(
+        self,
+        rc: AsyncRedisClient,
+        *,
+        key: str,
+        token_claim: TokenBase,
+        expected_jti: uuid.UUID,
+        expected_ip: IPvAnyAddress,
+    ) -> bool:
+        """
+        Atomically replace the cached token claim (keeping its ttl)
+        only if it still has the expected jti & ip.
+
+        Single round trip (server side script), so concurrent rotations
+        of the same token can't both succeed.
+
+        Returns:
+            bool: True if the token was rotated
+        """
+        rotated = await self._rotate_script(
+            keys=[key],
+            args=[str(expected_jti), str(expected_ip), token_claim.model_dump_json()],
+            client=rc,
+        )
+        return bool(rotated)
+
+    async def revoke(
+        self,
+        rc: AsyncRedisClient,
+        *,
+        key: str,
+        index_key: str | None = None,
+    ) -> None:
+        """Delete cached token (& remove it from its index)"""
+        async with rc.pipeline(transaction=True) as pipe:
+            pipe.unlink(key)
+            if index_key:
+                pipe.srem(index_key, key)
+            await pipe.execute()
+
+    async def revoke_all(
+        self,
+        rc: AsyncRedisClient,
+        *,
+        index_key: str,
+        extra_keys: list[str] | None = None,
+    ) -> list[str]:
+        """
+        Delete all cached tokens of the index, the index itself
+        & extra keys (e.g. derived caches)
+        in a single round trip (server side script, single redis node only)
+
+        Returns:
+            list[str]: Keys of the revoked tokens (that were not expired yet)
+        """
+        return await self._revoke_all_script(keys=[index_key, *(extra_keys or [])], client=rc)
+
+    async def backfill_index(
+        self,
+        rc: AsyncRedisClient,
+        *,
+        match: str,
+        index_key: Callable[[str], str],
+        ttl: int,
+    ) -> int:
+        """
+        Add the cached tokens matching the pattern to their index
+        (e.g. tokens cached before the index existed)
+
+        Args:
+            match (str): Pattern of the token keys (e.g. "rt:user:*:device:*")
+            index_key (Callable): Returns the index key of a token key
+            ttl (int): Index ttl, outliving the indexed tokens
+
+        Returns:
+            int: Number of indexed tokens
+        """
+        indexed = 0
+        async for key in rc.scan_iter(match=match, count=1000):
+            async with rc.pipeline(transaction=False) as pipe:
+                pipe.sadd(index_key(key), key)
+                pipe.expire(index_key(key), ttl)
+                added, _ = await pipe.execute()
+            indexed += added
+        return indexed
+
     async def get[T: TokenBase](
         self,
         rc: AsyncRedisClient,
@@ -29,6 +29,17 @@ class Settings(BaseSettings):
     JWT_SECRET_KEY: str
     REFRESH_TOKEN_EXPIRE_SECONDS: int
     ACCESS_TOKEN_EXPIRE_SECONDS: int
+    VERIFIED_TOKENS_CACHE_SIZE: int = 10_000
+    PWD_HASHING_MAX_WORKERS: int = 2
+    PWD_HASHING_MAX_PENDING: int = 32
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_WINDOW_SECONDS: int = 60
+    RATE_LIMIT_PER_IP: int = 30
+    RATE_LIMIT_PER_ACCOUNT: int = 10
+
+    # Metrics
+    METRICS_ENABLED: bool = False
+    METRICS_SCRAPE_TOKEN: str | None = None  # bearer token required to scrape /metrics
 
     # SMTP
     EMAILS_ENABLED: bool
@@ -38,12 +49,35 @@ class Settings(BaseSettings):
 
     # DB
     USE_PGBOUNCER: bool = False
+    PGBOUNCER_PREPARED_STATEMENTS: bool = False  # pgbouncer >= 1.21 with max_prepared_statements
     POSTGRES_URI: str | None
     PGBOUNCER_URI: str | None
     DATABASE_DSN: str | None = None
+    POSTGRES_REPLICA_URIS: list[str] = []
+    DB_REPLICA_HEALTH_CHECK_SECONDS: int = 10
+    DB_REPLICA_HEALTH_CHECK_TIMEOUT_SECONDS: int = 2
+    DB_STATEMENT_CACHE_SIZE: int = 500
+    DB_POOL_SIZE: int = 50  # pgbouncer pool size = 50
+    DB_POOL_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT_SECONDS: int = 100  # pgbouncer pool timeout = 100
+    # Max connections of all workers to a db server, splits the pools if set
+    DB_CONNECTIONS_BUDGET: int | None = None
+    WEB_CONCURRENCY: int = 1  # workers count, exported by gunicorn_conf.py
 
     # Cache
     REDIS_URI: str
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 60
+    RESPONSE_CACHE_TTL_SECONDS: int = 5 * 60
+    SYNC_QUEUE_SIZE: int = 100
+    SYNC_SSE_PING_SECONDS: int = 15
+    SYNC_SSE_SEND_TIMEOUT_SECONDS: int = 30
+    SYNC_SSE_MAX_LIFETIME_SECONDS: int = 60 * 60  # 1 hour
+    SYNC_SSE_MAX_PER_USER: int = 10
+    SYNC_SSE_LEASE_TTL_SECONDS: int = 60
+    SYNC_COMPACT_THRESHOLD: int = 20
+    SYNC_STREAM_ENABLED: bool = False
+    SYNC_STREAM_MAX_LEN: int = 1000
+    SYNC_STREAM_TTL_SECONDS: int = 60 * 60 * 24 * 7  # 1 week
 
     @field_validator("DATABASE_DSN", mode="before")
     def assemble_db_dsn(cls, v, info: ValidationInfo) -> str:
@@ -0,0 +1,77 @@
+import asyncio
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+
+from app.core import metrics, security
+from app.core.config import settings
+from app.utils.exceptions import ServiceUnavailableException
+
+
+class HashingPool:
+    """
+    Bounded thread pool running argon2 password hashing off the event loop.
+
+    argon2 releases the GIL while hashing, so threads hash in parallel
+    without blocking the other requests of the worker.
+
+    At most max_pending calls may be running or queued at once,
+    further calls are rejected right away (back pressure)
+    instead of piling up behind a login storm.
+    """
+
+    def __init__(self, *, max_workers: int, max_pending: int) -> None:
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.pending = 0
+        self._executor: ThreadPoolExecutor | None = None
+
+    async def run[T](self, fn: Callable[..., T], *args) -> T:
+        """
+        Run fn(*args) in the pool
+
+        Raises:
+            ServiceUnavailableException (503): If the pool is saturated
+        """
+        if self.pending >= self.max_pending:
+            raise ServiceUnavailableException
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="pwd-hashing",
+            )
+
+        self.pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, fn, *args)
+        finally:
+            self.pending -= 1
+
+    def shutdown(self) -> None:
+        """Shutdown the pool, waiting for running calls"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+
+pool = HashingPool(
+    max_workers=settings.PWD_HASHING_MAX_WORKERS,
+    max_pending=settings.PWD_HASHING_MAX_PENDING,
+)
+
+
+async def hash_pwd(pwd: str) -> str:
+    """Hash a password in the hashing pool (see `security.hash_pwd`)"""
+    return await pool.run(_timed, "hash", security.hash_pwd, pwd)
+
+
+async def verify_pwd(pwd: str, hash: str) -> bool:
+    """Verify a password in the hashing pool (see `security.verify_pwd`)"""
+    return await pool.run(_timed, "verify", security.verify_pwd, pwd, hash)
+
+
+def _timed[T](operation: str, fn: Callable[..., T], *args) -> T:
+    """Run fn(*args) recording its duration (in the hashing thread, excluding the queueing)"""
+    with metrics.PWD_HASHING_SECONDS.labels(operation).time():
+        return fn(*args)
@@ -0,0 +1,115 @@
+"""
+Prometheus metrics
+
+Multiprocess safe under gunicorn if PROMETHEUS_MULTIPROC_DIR is set (see scripts/start.sh):
+workers write their samples to files of that directory, aggregated on scrape.
+Pool gauges are per worker process (multiprocess mode "liveall"),
+the series of a dead worker are dropped (see `child_exit` in gunicorn_conf.py).
+"""
+
+import os
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+# HTTP (per route template, e.g. /v1/secrets/{cipher_id})
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_seconds",
+    "HTTP requests latency (till the response is fully sent)",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+HTTP_REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "HTTP requests being served",
+    ["method"],
+    multiprocess_mode="livesum",
+)
+HTTP_RESPONSE_BYTES = Histogram(
+    "http_response_bytes",
+    "HTTP responses body size",
+    ["method", "route"],
+    buckets=(100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000, 100_000_000),
+)
+
+# Sync
+SYNC_CONNECTIONS = Gauge(
+    "sync_connections",
+    "Open vault sync connections",
+    ["transport"],
+    multiprocess_mode="livesum",
+)
+
+# Redis
+REDIS_COMMAND_SECONDS = Histogram(
+    "redis_command_seconds",
+    "Redis commands latency (pipelines as a single PIPELINE command)",
+    ["command"],
+    buckets=LATENCY_BUCKETS,
+)
+
+# DB queries
+DB_QUERY_SECONDS = Histogram(
+    "db_query_seconds",
+    "DB queries latency",
+    ["engine"],
+    buckets=LATENCY_BUCKETS,
+)
+
+# Password hashing (argon2)
+PWD_HASHING_SECONDS = Histogram(
+    "pwd_hashing_seconds",
+    "Password hashing & verification (argon2) time",
+    ["operation"],
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+)
+
+# DB connection pools (per engine: primary, replica-0, ...)
+DB_POOL_SIZE = Gauge(
+    "db_pool_size",
+    "Connections kept in the pool",
+    ["engine"],
+    multiprocess_mode="liveall",
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out",
+    "Connections checked out of the pool",
+    ["engine"],
+    multiprocess_mode="liveall",
+)
+DB_POOL_OVERFLOW = Gauge(
+    "db_pool_overflow",
+    "Connections opened beyond the pool size",
+    ["engine"],
+    multiprocess_mode="liveall",
+)
+DB_POOL_WAIT_SECONDS = Histogram(
+    "db_pool_wait_seconds",
+    "Time waited to check a connection out of the pool",
+    ["engine"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 100),
+)
+DB_POOL_TIMEOUTS = Counter(
+    "db_pool_timeouts",
+    "Connection checkouts that timed out",
+    ["engine"],
+)
+
+
+def render() -> tuple[bytes, str]:
+    """Returns the metrics of all workers in the prometheus text format & its content type"""
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
@@ -0,0 +1,71 @@
+import time
+from typing import Any
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, ConnectionPoolEntry
+
+from app.core import metrics
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """
+    Async queue pool reporting its usage, checkout wait time & timeouts
+    (see `app.core.metrics`), labeled by its `pool_logging_name` (the engine name)
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.name = self._orig_logging_name or "default"
+        self.timeouts = 0
+        metrics.DB_POOL_SIZE.labels(self.name).set(self.size())
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            self.timeouts += 1
+            metrics.DB_POOL_TIMEOUTS.labels(self.name).inc()
+            raise
+        finally:
+            metrics.DB_POOL_WAIT_SECONDS.labels(self.name).observe(time.perf_counter() - start)
+            self._report()
+
+    def _do_return_conn(self, record: ConnectionPoolEntry) -> None:
+        super()._do_return_conn(record)
+        self._report()
+
+    def _report(self) -> None:
+        metrics.DB_POOL_CHECKED_OUT.labels(self.name).set(self.checkedout())
+        metrics.DB_POOL_OVERFLOW.labels(self.name).set(max(self.overflow(), 0))
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "size": self.size(),
+            "checked_out": self.checkedout(),
+            "overflow": max(self.overflow(), 0),
+            "timeouts": self.timeouts,
+        }
+
+
+def pool_sizing(
+    *,
+    pool_size: int,
+    max_overflow: int,
+    budget: int | None = None,
+    workers: int = 1,
+) -> tuple[int, int]:
+    """
+    Per worker (pool size, max overflow)
+
+    If a connections budget (per database server) is given,
+    it is split evenly between the workers: the pool size & overflow
+    are capped, so that all workers together don't exceed it
+    (each worker keeps at least one connection).
+    """
+    if not budget:
+        return pool_size, max_overflow
+    per_worker = max(budget // max(workers, 1), 1)
+    size = min(pool_size, per_worker)
+    overflow = min(max_overflow, per_worker - size)
+    return size, overflow
@@ -0,0 +1,71 @@
+import asyncio
+import itertools
+import logging
+
+import sqlalchemy as sa
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+
+class ReplicaSet:
+    """
+    Read replicas of the primary database.
+
+    Replicas are health checked periodically & reads are spread over the healthy ones.
+    Reads fail over to the primary while no replica is healthy.
+    """
+
+    def __init__(self, engines: list[AsyncEngine], *, interval: float, timeout: float) -> None:
+        self.engines = engines
+        self.interval = interval
+        self.timeout = timeout
+        self._healthy = list(engines)
+        self._counter = itertools.count()
+        self._checker: asyncio.Task | None = None
+
+    def pick(self) -> AsyncEngine | None:
+        """Returns the next healthy replica (round robin), None if there is none"""
+        healthy = self._healthy
+        if not healthy:
+            return None
+        return healthy[next(self._counter) % len(healthy)]
+
+    def mark_down(self, engine: AsyncEngine) -> None:
+        """Stop reading from replica till its next successful health check"""
+        if engine in self._healthy:
+            logger.warning("Read replica %s is down", engine.url)
+            self._healthy = [healthy for healthy in self._healthy if healthy is not engine]
+
+    async def check(self) -> None:
+        """Health check all replicas"""
+        results = await asyncio.gather(*(self._ping(engine) for engine in self.engines))
+        self._healthy = [engine for engine, ok in zip(self.engines, results, strict=True) if ok]
+
+    async def start(self) -> None:
+        """Start health checking replicas periodically"""
+        if self.engines and self._checker is None:
+            self._checker = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop health checks & close replicas connections"""
+        checker, self._checker = self._checker, None
+        if checker is not None:
+            checker.cancel()
+        for engine in self.engines:
+            await engine.dispose()
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.check()
+
+    async def _ping(self, engine: AsyncEngine) -> bool:
+        try:
+            async with asyncio.timeout(self.timeout):
+                async with engine.connect() as conn:
+                    await conn.execute(sa.text("SELECT 1"))
+        except Exception:
+            logger.warning("Read replica %s health check failed", engine.url, exc_info=True)
+            return False
+        return True
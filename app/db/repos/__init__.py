@@ -6,3 +6,4 @@ from .collection import collection
 from .cipher import cipher
 from .invitation import invitation
 from .device import device
+from .tombstone import tombstone
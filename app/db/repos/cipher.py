@@ -1,12 +1,16 @@
 import uuid
+from collections.abc import AsyncIterator
 from typing import override
 
 import sqlalchemy as sa
+import sqlalchemy.dialects.postgresql as pg
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing_extensions import deprecated
 
 from app import models, schemas
 from app.db.repos.base import BaseRepo
+from app.db.repos.user import user as user_repo
+from app.db.utils import ResultCount, query_results_count
 
 
 class CipherRepo(BaseRepo[models.Cipher, schemas.CipherCreate]):
@@ -20,56 +24,232 @@ class CipherRepo(BaseRepo[models.Cipher, schemas.CipherCreate]):
         user_id: uuid.UUID,
         obj_in: schemas.CipherCreate,
     ) -> models.Cipher:
-        cipher = await super().create(db, obj_in=obj_in)
-        cipher.user_id = user_id
-        return cipher
+        """
+        Create cipher & bump user vault revision
+        in a single INSERT ... RETURNING statement
+
+        Returns:
+            Created cipher
+        """
+        revision = user_repo.bump_revision_cte(user_id=user_id)
+        query = (
+            sa.insert(self.model)
+            .add_cte(revision)
+            .values(
+                **obj_in.model_dump(),
+                user_id=user_id,
+                revision=sa.select(revision.c.revision).scalar_subquery(),
+            )
+            .returning(self.model)
+        )
+        return await db.scalar(query)
+
+    async def update(
+        self,
+        db: AsyncSession,
+        *,
+        id: uuid.UUID,
+        user_id: uuid.UUID,
+        obj_in: schemas.CipherUpdate,
+    ) -> models.Cipher | None:
+        """
+        Update user cipher (set fields only) & bump user vault revision
+        in a single UPDATE ... RETURNING statement.
+        Return cipher if exists else returns None
+        """
+        values = obj_in.model_dump(exclude_unset=True)
+        return await self._update(db, id=id, user_id=user_id, values=values)
+
+    async def bulk_upsert(
+        self,
+        db: AsyncSession,
+        *,
+        user_id: uuid.UUID,
+        objs_in: list[schemas.CipherUpsert],
+        revision: int,
+    ) -> list[models.Cipher]:
+        """
+        Insert ciphers or update them on id conflict
+        in a single INSERT ... ON CONFLICT ... RETURNING statement.
+
+        Conflicting ciphers of other users are left untouched & not returned.
+        Updated ciphers must be locked beforehand (see `get_summaries`),
+        else a cipher deleted meanwhile would be inserted back.
+
+        Returns:
+            Written ciphers
+        """
+        if not objs_in:
+            return []
+
+        values = [
+            {
+                "id": obj.id,
+                "user_id": user_id,
+                "collection_id": obj.collection_id,
+                "type": obj.type,
+                "data": (
+                    obj.data
+                    if obj.data is not None
+                    # keep the current data
+                    else sa.select(self.model.data).where(self.model.id == obj.id).scalar_subquery()
+                ),
+                "revision": revision,
+            }
+            for obj in objs_in
+        ]
+
+        query = pg.insert(self.model).values(values)
+        query = query.on_conflict_do_update(
+            index_elements=[self.model.id],
+            set_={
+                "collection_id": query.excluded.collection_id,
+                "type": query.excluded.type,
+                "data": query.excluded.data,
+                "revision": query.excluded.revision,
+                "updated_at": sa.func.now(),
+            },
+            where=self.model.user_id == query.excluded.user_id,
+        ).returning(self.model)
+
+        result = await db.scalars(query)
+        return list(result.all())
+
+    async def get_summaries(
+        self,
+        db: AsyncSession,
+        *,
+        user_id: uuid.UUID,
+        ids: set[uuid.UUID],
+        lock: bool = False,
+    ) -> dict[uuid.UUID, sa.Row]:
+        """
+        Get (id, type, collection_id) of user ciphers by ids
+        without loading their data
+
+        If lock is set, the rows are locked (SELECT ... FOR UPDATE, in id order)
+        till the end of the transaction, so they can't be deleted
+        before the caller writes them (see `bulk_upsert`)
+        """
+        if not ids:
+            return {}
+        query = sa.select(self.model.id, self.model.type, self.model.collection_id).where(
+            self.model.user_id == user_id,
+            self.model.id.in_(ids),
+        )
+        if lock:
+            query = query.order_by(self.model.id).with_for_update()
+        result = await db.execute(query)
+        return {row.id: row for row in result}
+
+    async def get_page(
+        self,
+        db: AsyncSession,
+        *,
+        user_id: uuid.UUID,
+        limit: int,
+        cursor: schemas.Cursor | None = None,
+    ) -> tuple[list[models.Cipher], schemas.Cursor | None]:
+        """
+        Get a page of user non deleted ciphers ordered by (created_at, id).
+
+        Keyset pagination, the page starts right after the given cursor
+        so it costs the same regardless of how deep the page is.
+
+        Returns:
+            Page ciphers & the cursor of the next page (None if it is the last page)
+        """
+        query = self._vault_query(user_id=user_id)
+        if cursor:
+            query = query.where(
+                sa.tuple_(self.model.created_at, self.model.id)
+                > sa.tuple_(cursor.created_at, cursor.id)
+            )
+        query = query.order_by(self.model.created_at, self.model.id).limit(limit + 1)
+        result = await db.scalars(query)
+        ciphers = list(result.all())
+
+        if len(ciphers) <= limit:
+            return ciphers, None
+
+        ciphers = ciphers[:limit]
+        last = ciphers[-1]
+        return ciphers, schemas.Cursor(created_at=last.created_at, id=last.id)
+
+    async def stream_all(
+        self,
+        db: AsyncSession,
+        *,
+        user_id: uuid.UUID,
+        batch_size: int = 500,
+    ) -> AsyncIterator[models.Cipher]:
+        """
+        Stream all user ciphers (including soft deleted).
+
+        Uses a server side cursor fetching batch_size rows at a time,
+        so memory usage doesn't grow with the vault size.
+        """
+        query = (
+            sa.select(self.model)
+            .where(self.model.user_id == user_id)
+            .execution_options(yield_per=batch_size)
+        )
+        result = await db.stream_scalars(query)
+        async for cipher in result:
+            yield cipher
+
+    async def count(
+        self,
+        db: AsyncSession,
+        *,
+        user_id: uuid.UUID,
+    ) -> ResultCount:
+        """
+        Count user non deleted ciphers.
+        The count is approximated (query planner estimate) for large vaults
+        """
+        return await query_results_count(db, self._vault_query(user_id=user_id))
 
     async def soft_delete(
         self,
         db: AsyncSession,
         *,
         id: uuid.UUID,
+        user_id: uuid.UUID,
     ) -> models.Cipher | None:
         """
-        Soft delete cipher by marking deleted_at field.
+        Soft delete user cipher by marking deleted_at field
+        & bump user vault revision in a single UPDATE ... RETURNING statement.
         Return cipher if exists else returns None
         """
-        cipher = await self.get(db, id=id)
-        if not cipher:
-            return None
-        cipher.soft_delete()
-        return cipher
+        return await self._update(db, id=id, user_id=user_id, values={"deleted_at": sa.func.now()})
 
     async def restore(
         self,
         db: AsyncSession,
         *,
         id: uuid.UUID,
+        user_id: uuid.UUID,
     ) -> models.Cipher | None:
         """
-        Restore a soft deleted cipher
+        Restore a soft deleted user cipher
+        & bump user vault revision in a single UPDATE ... RETURNING statement.
         Return cipher if exists else returns None
         """
-        query = (
-            sa.update(self.model)
-            .where(self.model.id == id)
-            .values(deleted_at=None)
-            .returning(self.model)
-        )
-        result = await db.scalar(query)
-        return result
+        return await self._update(db, id=id, user_id=user_id, values={"deleted_at": None})
 
     async def permanent_delete(
         self,
         db: AsyncSession,
         *,
         id: uuid.UUID,
+        user_id: uuid.UUID,
     ) -> bool:
         """
-        Permanent delete cipher
+        Permanent delete user cipher
         Return True if cipher is deleted else False if cipher does not exist
         """
-        query = sa.delete(self.model).where(self.model.id == id)
+        query = sa.delete(self.model).where(self.model.id == id, self.model.user_id == user_id)
         result = await db.execute(query)
         return bool(result.rowcount)
 
@@ -78,23 +258,79 @@ class CipherRepo(BaseRepo[models.Cipher, schemas.CipherCreate]):
         db: AsyncSession,
         *,
         id: uuid.UUID,
+        user_id: uuid.UUID,
+        revision: int,
     ) -> list[uuid.UUID]:
         """
-        Soft delete all ciphers in a collection
+        Soft delete all user ciphers in a collection
         Returns list of cipher ids
         """
         query = (
             sa.update(self.model)
-            .where(self.model.collection_id == id)
+            .where(self.model.collection_id == id, self.model.user_id == user_id)
             .values(
                 deleted_at=sa.func.now(),
                 collection_id=None,
+                revision=revision,
             )
             .returning(self.model.id)
         )
         result = await db.scalars(query)
         return list(result.all())
 
+    async def get_changed(
+        self,
+        db: AsyncSession,
+        *,
+        user_id: uuid.UUID,
+        since: int,
+        until: int,
+    ) -> list[models.Cipher]:
+        """
+        Get user ciphers (including soft deleted)
+        changed in the revisions range (since, until]
+        """
+        query = sa.select(self.model).where(
+            self.model.user_id == user_id,
+            self.model.revision > since,
+            self.model.revision <= until,
+        )
+        result = await db.scalars(query)
+        return list(result.all())
+
+    async def _update(
+        self,
+        db: AsyncSession,
+        *,
+        id: uuid.UUID,
+        user_id: uuid.UUID,
+        values: dict,
+    ) -> models.Cipher | None:
+        """
+        Update user cipher with values & bump user vault revision
+        in a single UPDATE ... RETURNING statement.
+
+        The revision is bumped even if the cipher doesn't exist,
+        callers roll the transaction back in that case.
+        """
+        revision = user_repo.bump_revision_cte(user_id=user_id)
+        query = (
+            sa.update(self.model)
+            .add_cte(revision)
+            .where(self.model.id == id, self.model.user_id == user_id)
+            .values(**values, revision=sa.select(revision.c.revision).scalar_subquery())
+            .returning(self.model)
+            .execution_options(synchronize_session=False)
+        )
+        return await db.scalar(query)
+
+    def _vault_query(self, *, user_id: uuid.UUID) -> sa.Select:
+        """Select user non deleted ciphers"""
+        return sa.select(self.model).where(
+            self.model.user_id == user_id,
+            self.model.deleted_at == None,
+        )
+
     @deprecated("Use it in development only", category=DeprecationWarning)
     @override
     async def _get_all(
@@ -1,4 +1,5 @@
 import uuid
+from collections.abc import AsyncIterator
 from typing import override
 
 import sqlalchemy as sa
@@ -19,16 +20,84 @@ class CollectionRepo(BaseRepo[models.Collection, schemas.CollectionCreate]):
         *,
         user_id: uuid.UUID,
         obj_in: schemas.CollectionCreate,
+        revision: int,
     ) -> models.Collection:
         collection = await super().create(db, obj_in=obj_in)
         collection.user_id = user_id
+        collection.revision = revision
         return collection
 
-    async def delete(self, db: AsyncSession, *, id: uuid.UUID) -> bool:
-        query = sa.delete(self.model).where(self.model.id == id).returning(self.model.id)
+    async def get_owned(
+        self,
+        db: AsyncSession,
+        *,
+        id: uuid.UUID,
+        user_id: uuid.UUID,
+    ) -> models.Collection | None:
+        """Get user collection by id, None if it doesn't exist or belongs to another user"""
+        query = sa.select(self.model).where(self.model.id == id, self.model.user_id == user_id)
+        return await db.scalar(query)
+
+    async def delete(self, db: AsyncSession, *, id: uuid.UUID, user_id: uuid.UUID) -> bool:
+        query = (
+            sa.delete(self.model)
+            .where(self.model.id == id, self.model.user_id == user_id)
+            .returning(self.model.id)
+        )
         result = await db.scalar(query)
         return result is not None
 
+    async def get_owned_ids(
+        self,
+        db: AsyncSession,
+        *,
+        user_id: uuid.UUID,
+        ids: set[uuid.UUID],
+    ) -> set[uuid.UUID]:
+        """Get the ids that belong to user collections"""
+        if not ids:
+            return set()
+        query = sa.select(self.model.id).where(
+            self.model.user_id == user_id,
+            self.model.id.in_(ids),
+        )
+        result = await db.scalars(query)
+        return set(result.all())
+
+    async def stream_all(
+        self,
+        db: AsyncSession,
+        *,
+        user_id: uuid.UUID,
+        batch_size: int = 500,
+    ) -> AsyncIterator[models.Collection]:
+        """Stream all user collections using a server side cursor"""
+        query = (
+            sa.select(self.model)
+            .where(self.model.user_id == user_id)
+            .execution_options(yield_per=batch_size)
+        )
+        result = await db.stream_scalars(query)
+        async for collection in result:
+            yield collection
+
+    async def get_changed(
+        self,
+        db: AsyncSession,
+        *,
+        user_id: uuid.UUID,
+        since: int,
+        until: int,
+    ) -> list[models.Collection]:
+        """Get user collections changed in the revisions range (since, until]"""
+        query = sa.select(self.model).where(
+            self.model.user_id == user_id,
+            self.model.revision > since,
+            self.model.revision <= until,
+        )
+        result = await db.scalars(query)
+        return list(result.all())
+
     @deprecated("Use it in development only", category=DeprecationWarning)
     @override
     async def _get_all(
@@ -0,0 +1,56 @@
+import uuid
+from typing import override
+
+import sqlalchemy as sa
+import sqlalchemy.dialects.postgresql as pg
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import models, schemas
+from app.db.repos.base import BaseRepo
+
+
+class TombstoneRepo(BaseRepo[models.Tombstone, schemas.TombstoneCreate]):
+    """Tombstone repo"""
+
+    @override
+    async def create(
+        self,
+        db: AsyncSession,
+        *,
+        obj_in: schemas.TombstoneCreate,
+    ) -> models.Tombstone:
+        """
+        Create tombstone.
+        Overrides the tombstone of a previously deleted entity with the same id
+        """
+        query = (
+            pg.insert(self.model)
+            .values(obj_in.model_dump())
+            .on_conflict_do_update(
+                index_elements=[self.model.id],
+                set_={"revision": obj_in.revision, "deleted_at": sa.func.now()},
+            )
+            .returning(self.model)
+        )
+        result = await db.scalars(query)
+        return result.one()
+
+    async def get_changed(
+        self,
+        db: AsyncSession,
+        *,
+        user_id: uuid.UUID,
+        since: int,
+        until: int,
+    ) -> list[models.Tombstone]:
+        """Get user tombstones created in the revisions range (since, until]"""
+        query = sa.select(self.model).where(
+            self.model.user_id == user_id,
+            self.model.revision > since,
+            self.model.revision <= until,
+        )
+        result = await db.scalars(query)
+        return list(result.all())
+
+
+tombstone = TombstoneRepo(models.Tombstone)
@@ -1,3 +1,4 @@
+import uuid
 from typing import override
 
 import sqlalchemy as sa
@@ -5,8 +6,9 @@ import sqlalchemy.dialects.postgresql as pg
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app import models, schemas
-from app.core import security
+from app.core import hashing
 from app.db.repos.base import BaseRepo
+from app.utils.regex import generate_password
 
 
 class UserRepo(BaseRepo[models.User, schemas.UserInvite]):
@@ -21,6 +23,40 @@ class UserRepo(BaseRepo[models.User, schemas.UserInvite]):
         query = sa.select(models.User).where(models.User.email == email)
         return await db.scalar(query)
 
+    async def get_principal(
+        self,
+        db: AsyncSession,
+        *,
+        id: uuid.UUID | str,
+        device_id: str,
+    ) -> schemas.Principal | None:
+        """
+        Get principal of the user device session in a single joined query.
+        Returns None if the user or device doesn't exist
+        or if the device isn't registered to the user
+        """
+        query = (
+            sa.select(
+                models.User.id,
+                models.User.is_active,
+                models.User.is_admin,
+                models.Device.is_verified.label("device_verified"),
+            )
+            .join(models.Device, models.Device.user_id == models.User.id)
+            .where(models.User.id == id, models.Device.id == device_id)
+        )
+        result = await db.execute(query)
+        row = result.one_or_none()
+        return schemas.Principal.model_validate(row._asdict()) if row else None
+
+    @override
+    async def create(self, db: AsyncSession, *, obj_in: schemas.UserInvite) -> models.User:
+        """Create invited user with an auto generated password (hashed in the hashing pool)"""
+        user = models.User.create_from(obj_in)
+        await user.update_password(generate_password())
+        db.add(user)
+        return user
+
     @override
     async def bulk_create(
         self,
@@ -28,16 +64,74 @@ class UserRepo(BaseRepo[models.User, schemas.UserInvite]):
         *,
         objs_in: list[schemas.UserInvite]
     ) -> list[models.User]:
-        """Create bulk users. Skip conflicts"""
+        """
+        Create bulk invited users with auto generated passwords (hashed in the hashing pool).
+        Skip conflicts
+        """
+        values = [
+            o.model_dump() | {"master_pwd_hash": await hashing.hash_pwd(generate_password())}
+            for o in objs_in
+        ]
         query = (
             pg.insert(models.User)
-            .values([o.model_dump() for o in objs_in])
+            .values(values)
             .on_conflict_do_nothing(index_elements=[models.User.email])
             .returning(models.User)
         )
         res = await db.scalars(query)
         return list(res.all())
 
+    async def bump_revision(
+        self,
+        db: AsyncSession,
+        *,
+        user_id: uuid.UUID,
+    ) -> int:
+        """
+        Increment user vault revision.
+
+        The user row stays locked till the end of the transaction,
+        so concurrent vault changes of the same user are serialized
+        and committed in revision order.
+
+        Returns:
+            New vault revision
+        """
+        query = (
+            sa.update(models.User)
+            .where(models.User.id == user_id)
+            .values(revision=models.User.revision + 1)
+            .returning(models.User.revision)
+        )
+        result = await db.execute(query)
+        return result.scalar_one()
+
+    def bump_revision_cte(self, *, user_id: uuid.UUID) -> sa.CTE:
+        """
+        Increment user vault revision as a data modifying CTE,
+        to fold the bump into the statement of the vault change itself.
+
+        Select the new revision with `sa.select(cte.c.revision).scalar_subquery()`
+        """
+        return (
+            sa.update(models.User)
+            .where(models.User.id == user_id)
+            .values(revision=models.User.revision + 1)
+            .returning(models.User.revision)
+            .cte("vault_revision")
+        )
+
+    async def get_revision(
+        self,
+        db: AsyncSession,
+        *,
+        user_id: uuid.UUID,
+    ) -> int:
+        """Get user vault revision"""
+        query = sa.select(models.User.revision).where(models.User.id == user_id)
+        result = await db.execute(query)
+        return result.scalar_one()
+
     async def authenticate(
         self,
         db: AsyncSession,
@@ -45,11 +139,16 @@ class UserRepo(BaseRepo[models.User, schemas.UserInvite]):
         email: str,
         password: str,
     ) -> models.User | None:
-        """Authenticate user by email and password"""
+        """
+        Authenticate user by email and password
+
+        Raises:
+            ServiceUnavailableException (503): If the password hashing pool is saturated
+        """
         user = await self.get_by_email(db, email=email)
         if not user:
             return None
-        if not security.verify_pwd(password, user.master_pwd_hash):
+        if not await hashing.verify_pwd(password, user.master_pwd_hash):
             return None
         return user
 
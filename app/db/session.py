@@ -1,20 +1,153 @@
 """
-Sets up postgresql database connection pool.
+Sets up postgresql database connection pools.
 """
-from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from typing import Any
+
+from sqlalchemy import Engine, event
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.orm import Session, SessionTransaction
 
 from app.core.config import settings
+from app.db.pool import InstrumentedPool, pool_sizing
+from app.db.replicas import ReplicaSet
+from app.db.statements import (
+    StatementCacheStats,
+    instrument_query_latency,
+    instrument_statement_cache,
+    statement_cache_connect_args,
+)
+
+REPLICA = "replica"
+STICKY_PRIMARY = "sticky_primary"
+HAS_WRITTEN = "has_written"
+
+
+# Prepared statements cache stats per engine
+statement_cache_stats: dict[str, StatementCacheStats] = {}
+
+
+def create_engine(dsn: str, *, name: str) -> AsyncEngine:
+    stats = statement_cache_stats[name] = StatementCacheStats()
+    pool_size, max_overflow = pool_sizing(
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_POOL_MAX_OVERFLOW,
+        budget=settings.DB_CONNECTIONS_BUDGET,
+        workers=settings.WEB_CONCURRENCY,
+    )
+    engine = create_async_engine(
+        url=dsn,
+        echo=settings.is_dev,
+        future=True,
+        poolclass=InstrumentedPool,
+        pool_logging_name=name,
+        pool_pre_ping=True,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+        connect_args=statement_cache_connect_args(
+            stats,
+            pgbouncer=settings.USE_PGBOUNCER,
+            pgbouncer_prepared_statements=settings.PGBOUNCER_PREPARED_STATEMENTS,
+            cache_size=settings.DB_STATEMENT_CACHE_SIZE,
+        ),
+    )
+    instrument_statement_cache(engine, stats)
+    instrument_query_latency(engine, name=name)
+    return engine
 
-async_engine = create_async_engine(
-    url=str(settings.DATABASE_DSN),
-    echo=settings.is_dev,
-    future=True,
-    pool_pre_ping=True,
-    pool_size=50,  # pgbouncer pool size = 50
-    pool_timeout=100,  # pgbouncer pool timeout = 100
+
+async_engine = create_engine(str(settings.DATABASE_DSN), name="primary")
+
+replicas = ReplicaSet(
+    [
+        create_engine(dsn, name=f"replica-{i}")
+        for i, dsn in enumerate(settings.POSTGRES_REPLICA_URIS)
+    ],
+    interval=settings.DB_REPLICA_HEALTH_CHECK_SECONDS,
+    timeout=settings.DB_REPLICA_HEALTH_CHECK_TIMEOUT_SECONDS,
 )
 
+
+class RoutingSession(Session):
+    """
+    Session routing its reads to the replica it was opened with (if any, see `read_session`)
+
+    Writes (flushes, dml & locking selects) go to the primary,
+    and every statement after the first write sticks to the primary,
+    so reads following a write see it.
+    Writes are tracked per transaction (see `release_connection`).
+    """
+
+    def get_bind(self, mapper: Any = None, clause: Any = None, **kwargs: Any) -> Engine:
+        is_write = (
+            self._flushing
+            or getattr(clause, "is_dml", False)
+            or getattr(clause, "_for_update_arg", None) is not None
+        )
+        if is_write:
+            self.info[HAS_WRITTEN] = True
+            self.info[STICKY_PRIMARY] = True
+
+        replica: AsyncEngine | None = self.info.get(REPLICA)
+        if replica is None or self.info.get(STICKY_PRIMARY):
+            return async_engine.sync_engine
+
+        if getattr(clause, "is_select", False):
+            return replica.sync_engine
+        return async_engine.sync_engine
+
+
+@event.listens_for(RoutingSession, "after_transaction_end")
+def _reset_has_written(session: Session, transaction: SessionTransaction) -> None:
+    if transaction.parent is None:
+        session.info.pop(HAS_WRITTEN, None)
+
+
 AsyncSessionFactory = async_sessionmaker(
     async_engine,
+    sync_session_class=RoutingSession,
     expire_on_commit=False,
 )
+
+
+def read_session() -> AsyncSession:
+    """
+    Returns a session reading from a healthy replica
+    (the primary if there is none, or once it has written)
+    """
+    return AsyncSessionFactory(info={REPLICA: replicas.pick()})
+
+
+def reads_from_replica(db: AsyncSession) -> bool:
+    """Whether the next reads of the session go to a replica (see `RoutingSession`)"""
+    return db.info.get(REPLICA) is not None and not db.info.get(STICKY_PRIMARY)
+
+
+def read_from_primary(db: AsyncSession) -> None:
+    """Routes the next reads of the session to the primary (e.g. its replica is behind)"""
+    db.info[STICKY_PRIMARY] = True
+
+
+async def release_connection(db: AsyncSession) -> None:
+    """
+    Returns the connection of a read only session to the pool.
+
+    Sessions acquire a connection lazily, on their first statement,
+    & otherwise hold it till they are closed (end of the request).
+    Ending the read only transaction (commit, as loaded objects aren't expired on commit)
+    releases it early, the session stays usable & reacquires a connection if needed.
+
+    Only meant for sessions that only read so far: the transaction is left open
+    (connection kept) if it has pending changes, has written (flushes or dml statements,
+    see `RoutingSession`) or is nested, so writes are never committed here.
+    """
+    if not db.in_transaction() or db.in_nested_transaction():
+        return
+    if db.new or db.dirty or db.deleted or db.info.get(HAS_WRITTEN):
+        return
+    await db.commit()
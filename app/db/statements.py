@@ -0,0 +1,101 @@
+import time
+import uuid
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core import metrics
+
+
+class StatementCacheStats:
+    """
+    Prepared statements cache stats of an engine.
+
+    Every statement is executed as a prepared statement by the asyncpg driver,
+    it is only prepared (parsed & planned) on a cache miss.
+    """
+
+    def __init__(self) -> None:
+        self.executions = 0
+        self.prepares = 0
+
+    @property
+    def hits(self) -> int:
+        return max(self.executions - self.prepares, 0)
+
+    @property
+    def misses(self) -> int:
+        return self.prepares
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.executions if self.executions else 0.0
+
+    def statement_name(self) -> str:
+        """
+        Names a statement being prepared (a cache miss).
+        Unique across connections, as pgbouncer may share server connections.
+        """
+        self.prepares += 1
+        return f"__asyncpg_{uuid.uuid4().hex}__"
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "executions": self.executions,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hit_rate, 4),
+        }
+
+
+def statement_cache_connect_args(
+    stats: StatementCacheStats,
+    *,
+    pgbouncer: bool,
+    pgbouncer_prepared_statements: bool,
+    cache_size: int,
+) -> dict[str, Any]:
+    """
+    asyncpg connect args of the prepared statements cache, depending on the pooling topology
+
+    * direct: named prepared statements cached per connection
+    * pgbouncer (>= 1.21) with max_prepared_statements: same,
+    pgbouncer prepares the statements on the server connections it hands out
+    * pgbouncer (transaction pooling) without prepared statements support:
+    statements are prepared on every execution within the transaction & never cached
+    """
+    connect_args: dict[str, Any] = {"prepared_statement_name_func": stats.statement_name}
+    if pgbouncer and not pgbouncer_prepared_statements:
+        connect_args |= {"prepared_statement_cache_size": 0, "statement_cache_size": 0}
+    else:
+        connect_args |= {"prepared_statement_cache_size": cache_size}
+        if pgbouncer:
+            connect_args |= {"statement_cache_size": 0}
+    return connect_args
+
+
+def instrument_statement_cache(engine: AsyncEngine, stats: StatementCacheStats) -> None:
+    """Count the engine statements executions"""
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _count_execution(*args: Any) -> None:
+        stats.executions += 1
+
+
+def instrument_query_latency(engine: AsyncEngine, *, name: str) -> None:
+    """Record the engine queries latency (see `metrics.DB_QUERY_SECONDS`)"""
+    histogram = metrics.DB_QUERY_SECONDS.labels(name)
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _start(conn: Any, *args: Any) -> None:
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def _stop(conn: Any, *args: Any) -> None:
+        histogram.observe(time.perf_counter() - conn.info["query_start"].pop())
+
+    @event.listens_for(engine.sync_engine, "handle_error")
+    def _fail(context: Any) -> None:
+        if context.connection is not None and context.connection.info.get("query_start"):
+            context.connection.info["query_start"].pop()
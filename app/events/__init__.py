@@ -1,3 +1,5 @@
+from .hub import hub
 from .listen import listen
+from .notifier import Notifier
 from .notify import notify
-from .sync_data import SyncData
+from .sync_data import SyncData, SyncDataBatch
@@ -0,0 +1,168 @@
+import asyncio
+import logging
+from collections.abc import AsyncIterator
+
+from redis.asyncio.client import PubSub
+
+from app.cache.client import AsyncRedisClient
+from app.core.config import settings
+from app.utils.tasks import spawn
+
+logger = logging.getLogger(__name__)
+
+
+class Subscription:
+    """
+    Subscription of a single connection to a channel of the hub
+
+    Messages are buffered in a bounded queue.
+    A subscription that can't keep up is closed rather than silently
+    dropping messages, its client is expected to reconnect & resync.
+    """
+
+    def __init__(self, channel: str, *, maxsize: int) -> None:
+        self.channel = channel
+        self.closed = False
+        self._queue: asyncio.Queue[str | None] = asyncio.Queue(maxsize=maxsize)
+
+    def put(self, data: str) -> None:
+        """Buffer message, closes the subscription if the buffer is full"""
+        if self.closed:
+            return
+        try:
+            self._queue.put_nowait(data)
+        except asyncio.QueueFull:
+            self.close()
+
+    def close(self) -> None:
+        """Close subscription, pending messages are discarded"""
+        if self.closed:
+            return
+        self.closed = True
+        while not self._queue.empty():
+            self._queue.get_nowait()
+        self._queue.put_nowait(None)
+
+    async def get(self) -> str | None:
+        """Wait for the next message, None once the subscription is closed"""
+        return await self._queue.get()
+
+    async def __aiter__(self) -> AsyncIterator[str]:
+        while (data := await self.get()) is not None:
+            yield data
+
+
+class PubSubHub:
+    """
+    Single redis pubsub connection per worker process
+    multiplexing the channels of all its connected clients.
+
+    A channel is subscribed in redis when its first subscription is opened
+    & unsubscribed when its last one is closed.
+    Messages are fanned out to the subscriptions of their channel.
+    """
+
+    def __init__(self, *, queue_size: int) -> None:
+        self.queue_size = queue_size
+        self._subscriptions: dict[str, set[Subscription]] = {}
+        self._channels: set[str] = set()
+        self._lock = asyncio.Lock()
+        self._pubsub: PubSub | None = None
+        self._reader: asyncio.Task | None = None
+
+    async def subscribe(self, channel: str) -> Subscription:
+        """Open a subscription to channel"""
+        subscription = Subscription(channel, maxsize=self.queue_size)
+        self._subscriptions.setdefault(channel, set()).add(subscription)
+        try:
+            async with self._lock:
+                if self._pubsub is None:
+                    self._pubsub = AsyncRedisClient().pubsub(ignore_subscribe_messages=True)
+                if channel not in self._channels:
+                    await self._pubsub.subscribe(channel)
+                    self._channels.add(channel)
+                # read only once subscribed, the pubsub has no connection before
+                if self._reader is None or self._reader.done():
+                    self._reader = asyncio.create_task(self._read(self._pubsub))
+        except BaseException:
+            self.unsubscribe(subscription)
+            raise
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """
+        Close the subscription.
+
+        Doesn't await (safe in cancelled tasks),
+        the channel is unsubscribed from redis in the background
+        if it was its last subscription.
+        """
+        subscription.close()
+        subscriptions = self._subscriptions.get(subscription.channel)
+        if subscriptions is None:
+            return
+        subscriptions.discard(subscription)
+        if not subscriptions:
+            del self._subscriptions[subscription.channel]
+            spawn(self._release(subscription.channel))
+
+    async def close(self) -> None:
+        """Close all subscriptions & the redis pubsub"""
+        async with self._lock:
+            await self._reset()
+
+    async def _release(self, channel: str) -> None:
+        """Unsubscribe channel from redis if it has no subscriptions left"""
+        async with self._lock:
+            if (
+                self._pubsub is None \
+                or channel in self._subscriptions \
+                or channel not in self._channels
+            ):  # fmt: off
+                return
+            await self._pubsub.unsubscribe(channel)
+            self._channels.discard(channel)
+
+    async def _read(self, pubsub: PubSub) -> None:
+        """Fan out the messages of the pubsub to the channels subscriptions"""
+        while True:
+            try:
+                message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=None)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Sync pubsub connection failed")
+                # Messages may have been lost, clients have to reconnect & resync
+                spawn(self.close())
+                return
+
+            if not message or message["type"] != "message":
+                continue
+
+            channel, data = message["channel"], message["data"]
+            if isinstance(channel, bytes):
+                channel = channel.decode()
+            if isinstance(data, bytes):
+                data = data.decode()
+
+            for subscription in tuple(self._subscriptions.get(channel, ())):
+                subscription.put(data)
+
+    async def _reset(self) -> None:
+        """Close all subscriptions, stop reading & close the redis pubsub"""
+        for subscriptions in self._subscriptions.values():
+            for subscription in subscriptions:
+                subscription.close()
+        self._subscriptions.clear()
+        self._channels.clear()
+
+        reader, self._reader = self._reader, None
+        if reader is not None and reader is not asyncio.current_task():
+            reader.cancel()
+
+        pubsub, self._pubsub = self._pubsub, None
+        if pubsub is not None:
+            await pubsub.aclose()
+
+
+hub = PubSubHub(queue_size=settings.SYNC_QUEUE_SIZE)
@@ -1,22 +1,117 @@
+import asyncio
+import logging
 import uuid
-from collections.abc import AsyncIterator
+from collections.abc import AsyncGenerator
+from contextlib import aclosing
 
 from app import cache
 from app.cache.client import AsyncRedisClient
+from app.cache.service import Lease
+from app.core import metrics
+from app.core.config import settings
+from app.events import stream
+from app.events.hub import Subscription, hub
+from app.utils.tasks import spawn
 
-__pubsub_settings__ = {
-    "ignore_subscribe_messages": True,
-}
+logger = logging.getLogger(__name__)
+
+RESET_EVENT = {"event": "reset", "data": ""}
 
 
 async def listen(
     rc: AsyncRedisClient,
     *,
     user_id: uuid.UUID,
-) -> AsyncIterator:
-    """Listen for user vault changes"""
-    async with rc.pubsub(**__pubsub_settings__) as pubsub:
-        await pubsub.subscribe(cache.keys.sync_vault_pubsub(user_id))
-        async for message in pubsub.listen():
-            if message["type"] == "message":
-                yield message["data"]
+    last_event_id: str | None = None,
+    lease: Lease | None = None,
+    max_lifetime: float | None = None,
+    transport: str = "sse",
+) -> AsyncGenerator[dict, None]:
+    """
+    Listen for user vault changes
+
+    Served by the pubsub hub of the worker,
+    so all listeners share a single redis connection.
+
+    If the sync stream is enabled & last_event_id is given,
+    the events missed since are replayed first,
+    or a reset event is sent if they can't be (client has to fully resync).
+
+    Stops after max_lifetime seconds if given.
+    The lease (if any) is renewed while listening & released once done.
+    Its owner should release it too if the listener may never be iterated
+    (e.g. response background task), releasing is idempotent.
+    Open listeners are counted per transport (see `metrics.SYNC_CONNECTIONS`).
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + max_lifetime if max_lifetime else None
+    renewal = spawn(_renew(rc, lease=lease)) if lease else None
+    subscription = None
+    connections = metrics.SYNC_CONNECTIONS.labels(transport)
+    connections.inc()
+
+    try:
+        subscription = await hub.subscribe(cache.keys.sync_vault_pubsub(user_id))
+
+        # Subscribed before replaying, so no event is lost in between
+        replayed: list[tuple[str, str]] | None = []
+        if last_event_id and settings.SYNC_STREAM_ENABLED:
+            replayed = await stream.replay(rc, user_id=user_id, after=last_event_id)
+            if replayed is None:
+                yield RESET_EVENT
+
+        for entry_id, payload in replayed or []:
+            yield {"id": entry_id, "data": payload}
+
+        last_id = stream.parse_id(replayed[-1][0]) if replayed else None
+        async with aclosing(_pump(subscription, deadline=deadline, after=last_id)) as events:
+            async for event in events:
+                yield event
+    finally:
+        connections.dec()
+        if subscription:
+            hub.unsubscribe(subscription)
+        if renewal:
+            renewal.cancel()
+        if lease:
+            spawn(cache.leases.release(rc, lease=lease))
+
+
+async def _pump(
+    subscription: Subscription,
+    *,
+    deadline: float | None,
+    after: stream.EntryID | None,
+) -> AsyncGenerator[dict, None]:
+    """
+    Yield the published events till the subscription ends or the deadline,
+    skipping the ones up to `after` (already replayed)
+    """
+    loop = asyncio.get_running_loop()
+    while True:
+        try:
+            timeout = deadline - loop.time() if deadline else None
+            message = await asyncio.wait_for(subscription.get(), timeout)
+        except TimeoutError:
+            return
+        if message is None:
+            return
+
+        entry_id, payload = stream.unframe(message)
+        if entry_id is None:
+            yield {"data": payload}
+            continue
+
+        if after and (parsed_id := stream.parse_id(entry_id)) and parsed_id <= after:
+            continue
+        yield {"id": entry_id, "data": payload}
+
+
+async def _renew(rc: AsyncRedisClient, *, lease: Lease) -> None:
+    """Renew lease every half of its ttl"""
+    while True:
+        await asyncio.sleep(lease.ttl / 2)
+        try:
+            await cache.leases.renew(rc, lease=lease)
+        except Exception:
+            logger.exception("Failed to renew sync stream lease")
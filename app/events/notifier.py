@@ -0,0 +1,76 @@
+import itertools
+import uuid
+
+from app import cache
+from app.cache.client import AsyncRedisClient
+from app.core.config import settings
+from app.events.notify import get_type, publish
+from app.events.sync_data import SyncData, SyncDataBatch
+from app.schemas import Cipher, Collection
+from app.schemas.enums import Op
+
+
+class Notifier:
+    """
+    Collects the sync events of a request
+    & publishes them once the request succeeded.
+
+    All events of a user are published as a single payload,
+    the event itself if there is only one, else a batch of events.
+    Large runs of cipher events of the same action are compacted into a single ids event.
+    The cached responses of notified users are invalidated beforehand.
+    """
+
+    def __init__(self, rc: AsyncRedisClient) -> None:
+        self.rc = rc
+        self._events: dict[uuid.UUID, list[SyncData]] = {}
+
+    def add(
+        self,
+        *,
+        user_id: uuid.UUID,
+        data: Collection | Cipher | uuid.UUID | list[uuid.UUID],
+        action: Op,
+    ) -> None:
+        """Add user vault change to be notified on flush"""
+        sync_data = SyncData(action=action, data=data, type=get_type(data))
+        self._events.setdefault(user_id, []).append(sync_data)
+
+    async def flush(self) -> None:
+        """Invalidate cached responses & publish collected events"""
+        events, self._events = self._events, {}
+        for user_id, user_events in events.items():
+            await cache.responses.invalidate(self.rc, user_id=user_id)
+            user_events = compact(user_events, threshold=settings.SYNC_COMPACT_THRESHOLD)
+            payload = user_events[0] if len(user_events) == 1 else SyncDataBatch(events=user_events)
+            await publish(self.rc, user_id=user_id, payload=payload.model_dump_json())
+
+
+def compact(events: list[SyncData], *, threshold: int) -> list[SyncData]:
+    """
+    Compact consecutive cipher events (cipher, id & ids) of the same action
+    into a single ids event if there are more than threshold ciphers,
+    clients then fetch the changed ciphers (see `/v1/sync/changes`)
+    """
+    compacted: list[SyncData] = []
+    for (action, is_cipher), run in itertools.groupby(
+        events,
+        key=lambda event: (event.action, event.type != "collection"),
+    ):
+        run = list(run)
+        ids = [id for event in run for id in _cipher_ids(event)] if is_cipher else []
+        if len(ids) > threshold:
+            compacted.append(SyncData(action=action, data=ids, type="ids"))
+        else:
+            compacted.extend(run)
+    return compacted
+
+
+def _cipher_ids(event: SyncData) -> list[uuid.UUID]:
+    if isinstance(event.data, Cipher):
+        return [event.data.id]
+    elif isinstance(event.data, list):
+        return event.data
+    elif isinstance(event.data, uuid.UUID):
+        return [event.data]
+    return []
@@ -2,6 +2,8 @@ import uuid
 
 from app import cache
 from app.cache.client import AsyncRedisClient
+from app.core.config import settings
+from app.events import stream
 from app.events.sync_data import SyncData
 from app.schemas import Cipher, Collection
 from app.schemas.enums import Op
@@ -11,20 +13,38 @@ async def notify(
     rc: AsyncRedisClient,
     *,
     user_id: uuid.UUID,
-    data: Collection | Cipher | uuid.UUID,
+    data: Collection | Cipher | uuid.UUID | list[uuid.UUID],
     action: Op,
 ) -> None:
     """Notify user vault changes"""
     sync_data = SyncData(action=action, data=data, type=get_type(data))
-    await rc.publish(
-        cache.keys.sync_vault_pubsub(user_id),
-        sync_data.model_dump_json(),
-    )
+    await publish(rc, user_id=user_id, payload=sync_data.model_dump_json())
+
+
+async def publish(
+    rc: AsyncRedisClient,
+    *,
+    user_id: uuid.UUID,
+    payload: str,
+) -> None:
+    """
+    Publish sync payload to the user connected devices
+
+    Appended to the user sync stream as well if enabled,
+    so that reconnecting devices can replay the changes they missed
+    """
+    if settings.SYNC_STREAM_ENABLED:
+        await stream.append(rc, user_id=user_id, payload=payload)
+    else:
+        await rc.publish(cache.keys.sync_vault_pubsub(user_id), payload)
+
 
 def get_type(data):
     if isinstance(data, Collection):
         return "collection"
     elif isinstance(data, Cipher):
         return "cipher"
+    elif isinstance(data, list):
+        return "ids"
     else:
         return "id"
@@ -0,0 +1,113 @@
+"""
+Replayable sync events
+
+Sync events are appended to a capped per user redis stream
+& published along with their stream entry id,
+framed as "<entry id>\\n<payload>" (payloads are single line json).
+
+A client reconnecting with the id of the last event it received
+gets the entries it missed replayed from the stream.
+"""
+
+import uuid
+
+from app import cache
+from app.cache.client import AsyncRedisClient
+from app.core.config import settings
+
+# KEYS: stream, channel
+# ARGV: max length, ttl, payload
+APPEND_LUA = """
+local id = redis.call('XADD', KEYS[1], 'MAXLEN', '~', ARGV[1], '*', 'data', ARGV[3])
+redis.call('EXPIRE', KEYS[1], ARGV[2])
+redis.call('PUBLISH', KEYS[2], id .. '\\n' .. ARGV[3])
+return id
+"""
+
+_append_script = AsyncRedisClient().register_script(APPEND_LUA)
+
+type EntryID = tuple[int, int]
+
+
+async def append(
+    rc: AsyncRedisClient,
+    *,
+    user_id: uuid.UUID,
+    payload: str,
+) -> str:
+    """
+    Append sync event to the user stream & publish it
+    atomically (single script call)
+
+    Returns:
+        Stream entry id of the event
+    """
+    entry_id = await _append_script(
+        keys=[cache.keys.sync_vault_stream(user_id), cache.keys.sync_vault_pubsub(user_id)],
+        args=[settings.SYNC_STREAM_MAX_LEN, settings.SYNC_STREAM_TTL_SECONDS, payload],
+        client=rc,
+    )
+    return to_str(entry_id)
+
+
+async def replay(
+    rc: AsyncRedisClient,
+    *,
+    user_id: uuid.UUID,
+    after: str,
+) -> list[tuple[str, str]] | None:
+    """
+    Get the user sync events appended after the given entry id
+
+    Returns:
+        (entry id, payload) of the events in order,
+        or None if events may have been trimmed from the stream since,
+        more than SYNC_STREAM_MAX_LEN events were appended since
+        (approximate trimming may keep more) or after isn't a valid entry id,
+        the client has to fully resync then
+    """
+    after_id = parse_id(after)
+    if after_id is None:
+        return None
+
+    max_len = settings.SYNC_STREAM_MAX_LEN
+    key = cache.keys.sync_vault_stream(user_id)
+    async with rc.pipeline(transaction=True) as pipe:
+        pipe.xrange(key, count=1)
+        pipe.xrange(key, min="({}-{}".format(*after_id), count=max_len + 1)
+        oldest, entries = await pipe.execute()
+
+    oldest_id = parse_id(to_str(oldest[0][0])) if oldest else None
+    if oldest_id and oldest_id > after_id:
+        return None
+    if len(entries) > max_len:
+        return None
+
+    return [
+        (to_str(entry_id), to_str(fields.get("data") or fields[b"data"]))
+        for entry_id, fields in entries
+    ]
+
+
+def unframe(message: str) -> tuple[str | None, str]:
+    """
+    Split a published sync message into (entry id, payload)
+    entry id is None if the message wasn't appended to a stream
+    """
+    entry_id, sep, payload = message.partition("\n")
+    if not sep:
+        return None, message
+    return entry_id, payload
+
+
+def parse_id(entry_id: str) -> EntryID | None:
+    """Parse stream entry id "<ms>-<seq>" into a comparable tuple, None if invalid"""
+    ms, _, seq = entry_id.partition("-")
+    try:
+        return int(ms), int(seq or 0)
+    except ValueError:
+        return None
+
+
+def to_str(value: str | bytes) -> str:
+    return value.decode() if isinstance(value, bytes) else value
@@ -10,6 +10,15 @@ class SyncData(BaseSchema):
     Sync data schema
     """
 
-    data: Collection | Cipher | uuid.UUID
-    type: Literal["collection", "cipher", "id"]
+    data: Collection | Cipher | uuid.UUID | list[uuid.UUID]
+    type: Literal["collection", "cipher", "id", "ids"]
     action: Op
+
+
+class SyncDataBatch(BaseSchema):
+    """
+    Sync events of a single vault change request, in order
+    """
+
+    events: list[SyncData]
+    type: Literal["batch"] = "batch"
@@ -1,8 +1,13 @@
 from fastapi import FastAPI
 from fastapi.middleware import cors
+from fastapi.responses import ORJSONResponse
 
+from app.api.middlewares import MetricsMiddleware
 from app.api.routes import api
+from app.core import hashing
 from app.core.config import settings
+from app.db.session import replicas
+from app.events import hub
 
 
 def add_routers(app: FastAPI) -> None:
@@ -10,6 +15,8 @@ def add_routers(app: FastAPI) -> None:
 
 
 def add_middlewares(app: FastAPI) -> None:
+    if settings.METRICS_ENABLED:
+        app.add_middleware(MetricsMiddleware)
     app.add_middleware(
         cors.CORSMiddleware,
         allow_origins=["*"],
@@ -19,6 +26,13 @@ def add_middlewares(app: FastAPI) -> None:
     )
 
 
+def add_event_handlers(app: FastAPI) -> None:
+    app.add_event_handler("startup", replicas.start)
+    app.add_event_handler("shutdown", replicas.stop)
+    app.add_event_handler("shutdown", hashing.pool.shutdown)
+    app.add_event_handler("shutdown", hub.close)
+
+
 def create_app() -> FastAPI:
     """App factory"""
     app = FastAPI(
@@ -27,9 +41,11 @@ def create_app() -> FastAPI:
         openapi_url="/openapi.json",
         docs_url="/docs",
         redoc_url="/redoc",
+        default_response_class=ORJSONResponse,
     )
     add_routers(app)
     add_middlewares(app)
+    add_event_handlers(app)
     return app
 
 
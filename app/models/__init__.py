@@ -15,3 +15,5 @@ from .cipher import Cipher
 from .collection import Collection
 
 from .invitation import Invitation
+
+from .tombstone import Tombstone
@@ -13,6 +13,13 @@ from app.schemas.enums import CipherType
 
 
 class Cipher(BaseModel):
+    __table_args__ = (
+        # Keyset pagination of user vault
+        sa.Index("ix_cipher_user_id_created_at_id", "user_id", "created_at", "id"),
+        # Vault delta sync
+        sa.Index("ix_cipher_user_id_revision", "user_id", "revision"),
+    )
+
     # fmt: off
     id: Mapped[uuid.UUID] = mapped_column(pg.UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id: Mapped[uuid.UUID] = mapped_column(pg.UUID(as_uuid=True), sa.ForeignKey("user.id"), index=True, nullable=False)
@@ -22,6 +29,7 @@ class Cipher(BaseModel):
     created_at: Mapped[dt.datetime] = mapped_column(sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now())
     updated_at: Mapped[dt.datetime | None] = mapped_column(sa.DateTime(timezone=True), nullable=True, onupdate=sa.func.now())
     deleted_at: Mapped[dt.datetime | None] = mapped_column(sa.DateTime(timezone=True), nullable=True)
+    revision: Mapped[int] = mapped_column(sa.BigInteger, nullable=False, server_default="0")
     # fmt: on
     @override
     def import_from(self, obj: schemas.CipherBase) -> None:
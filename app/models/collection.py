@@ -9,11 +9,17 @@ from app.models import BaseModel
 
 
 class Collection(BaseModel):
+    __table_args__ = (
+        # Vault delta sync
+        sa.Index("ix_collection_user_id_revision", "user_id", "revision"),
+    )
+
     # fmt: off
     id: Mapped[uuid.UUID] = mapped_column(pg.UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id: Mapped[uuid.UUID] = mapped_column(pg.UUID(as_uuid=True), sa.ForeignKey("user.id"), index=True, nullable=False)
     name: Mapped[str] = mapped_column(sa.String, nullable=False)
     created_at: Mapped[dt.datetime] = mapped_column(sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now())
+    revision: Mapped[int] = mapped_column(sa.BigInteger, nullable=False, server_default="0")
     # fmt: on
 
     sa.UniqueConstraint(user_id, name, name="uix_collection_user_id_name")
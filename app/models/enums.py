@@ -1,5 +1,6 @@
 from sqlalchemy.dialects import postgresql as pg
 
-from app.schemas.enums import CipherType
+from app.schemas.enums import CipherType, VaultEntity
 
 PgCipherType = pg.ENUM(CipherType, name="cipher_type")
+PgVaultEntity = pg.ENUM(VaultEntity, name="vault_entity")
@@ -0,0 +1,32 @@
+import datetime as dt
+import uuid
+
+import sqlalchemy as sa
+import sqlalchemy.dialects.postgresql as pg
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models import BaseModel
+from app.models.enums import PgVaultEntity
+from app.schemas.enums import VaultEntity
+
+"""
+    Tombstone:
+        Marks a permanently deleted vault entity (cipher or collection)
+        so that delta syncing clients can drop it as well.
+        id is the id of the deleted entity.
+"""
+
+
+class Tombstone(BaseModel):
+    __table_args__ = (
+        # Vault delta sync
+        sa.Index("ix_tombstone_user_id_revision", "user_id", "revision"),
+    )
+
+    # fmt: off
+    id: Mapped[uuid.UUID] = mapped_column(pg.UUID(as_uuid=True), primary_key=True)
+    user_id: Mapped[uuid.UUID] = mapped_column(pg.UUID(as_uuid=True), sa.ForeignKey("user.id"), nullable=False)
+    type: Mapped[VaultEntity] = mapped_column(PgVaultEntity, nullable=False)
+    revision: Mapped[int] = mapped_column(sa.BigInteger, nullable=False)
+    deleted_at: Mapped[dt.datetime] = mapped_column(sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now())
+    # fmt: on
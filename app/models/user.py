@@ -3,10 +3,10 @@ import uuid
 from typing import Self
 
 import sqlalchemy.dialects.postgresql as pg
-from sqlalchemy import DateTime, String, func
+from sqlalchemy import BigInteger, DateTime, String, func
 from sqlalchemy.orm import Mapped, mapped_column
 
-from app.core import security
+from app.core import hashing
 from app.models import BaseModel
 
 """
@@ -15,6 +15,8 @@ from app.models import BaseModel
         https://stackoverflow.com/questions/1199190/what-is-the-optimal-length-for-an-email-address-in-a-database
     Password:
         passwords are hashed using agron2 which automatically generates a salt
+    Revision:
+        vault revision, bumped on every change of the user ciphers or collections
 """
 
 
@@ -30,11 +32,12 @@ class User(BaseModel):
     last_pwd_change: Mapped[dt.datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     last_email_change: Mapped[dt.datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     created_at: Mapped[dt.datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    revision: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0, server_default="0")
     # fmt: on
 
-    def update_password(self, password: str) -> Self:
-        """Hashes the already 2 time KDF hash of master password client side"""
-        self.master_pwd_hash = security.hash_pwd(password)
+    async def update_password(self, password: str) -> Self:
+        """Hashes the already 2 time KDF hash of master password client side (in the hashing pool)"""
+        self.master_pwd_hash = await hashing.hash_pwd(password)
         return self
 
     def activate(self) -> Self:
@@ -2,12 +2,16 @@
 
 from .base import BaseSchema
 
+from .pagination import Cursor, Page
+
 from .user import (
     UserInvite,
     UserLogin,
     User,
 )
 
+from .principal import Principal
+
 from .device import Device, DeviceCreate
 
 from .collection import (
@@ -21,8 +25,17 @@ from .cipher import (
     CipherCreate,
     CipherUpdate,
     Cipher,
+    CipherBulkUpdate,
+    CipherBulkWrite,
+    CipherUpsert,
+    CipherBulkResult,
+    CipherBulkWriteResult,
 )
 
+from .tombstone import TombstoneCreate, Tombstone
+
+from .sync import VaultChanges, SyncAck, SyncChangesRequest, SyncClientMessage
+
 from .token import (
     TokenBase,
     AccessTokenClaim,
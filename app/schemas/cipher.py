@@ -1,7 +1,7 @@
 import datetime as dt
 import uuid
 
-from pydantic import ConfigDict
+from pydantic import ConfigDict, Field
 
 from app.schemas.base import BaseSchema
 from app.schemas.enums import CipherType
@@ -31,5 +31,39 @@ class Cipher(CipherBase):
     created_at: dt.datetime
     updated_at: dt.datetime | None
     deleted_at: dt.datetime | None
+    revision: int
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class CipherBulkUpdate(CipherUpdate):
+    id: uuid.UUID
+
+
+class CipherBulkWrite(BaseSchema):
+    create: list[CipherCreate] = Field(default_factory=list, max_length=1000)
+    update: list[CipherBulkUpdate] = Field(default_factory=list, max_length=1000)
+
+
+class CipherUpsert(CipherBase):
+    """
+    Cipher row to insert, or to update on id conflict.
+    None data keeps the current cipher data.
+    """
+
+    id: uuid.UUID
+    collection_id: uuid.UUID | None
+    type: CipherType
+    data: bytes | None
+
+
+class CipherBulkResult(BaseSchema):
+    index: int
+    ok: bool = False
+    cipher: Cipher | None = None
+    error: str | None = None
+
+
+class CipherBulkWriteResult(BaseSchema):
+    create: list[CipherBulkResult]
+    update: list[CipherBulkResult]
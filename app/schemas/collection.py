@@ -19,5 +19,6 @@ class Collection(BaseSchema):
     user_id: uuid.UUID
     name: str
     created_at: dt.datetime
+    revision: int
 
     model_config = ConfigDict(from_attributes=True)
@@ -15,6 +15,11 @@ class CipherType(BaseEnum):
     NOTE = auto()
 
 
+class VaultEntity(BaseEnum):
+    CIPHER = auto()
+    COLLECTION = auto()
+
+
 class TokenType(BaseEnum):
     ACCESS = auto()
     REFRESH = auto()
@@ -50,3 +55,4 @@ class Op(BaseEnum):
     RESTORE = auto()
     DELETE = auto()
     SOFT_DELETE = auto()
+    UPSERT = auto()
@@ -0,0 +1,54 @@
+import base64
+import binascii
+import datetime as dt
+import uuid
+from typing import Generic, Self, TypeVar
+
+from app.schemas.base import BaseSchema
+from app.utils.exceptions import InvalidCursorException
+
+T = TypeVar("T")
+
+
+class Cursor(BaseSchema):
+    """
+    Keyset pagination cursor
+
+    Points at the last item of a page.
+    The next page starts right after it in (created_at, id) order.
+    """
+
+    created_at: dt.datetime
+    id: uuid.UUID
+
+    def encode(self) -> str:
+        """Encode the cursor into an opaque url safe string"""
+        return base64.urlsafe_b64encode(self.model_dump_json().encode()).decode()
+
+    @classmethod
+    def decode(cls, token: str) -> Self:
+        """
+        Decode a cursor encoded with `Cursor.encode`
+
+        Raises:
+            InvalidCursorException (400): If the token is malformed
+        """
+        try:
+            return cls.model_validate_json(base64.urlsafe_b64decode(token.encode()))
+        except (ValueError, binascii.Error):
+            raise InvalidCursorException
+
+
+class Page(BaseSchema, Generic[T]):
+    """
+    Keyset paginated results
+
+    count is approximated for large result sets (see is_exact_count).
+    next_cursor & next are None on the last page.
+    """
+
+    items: list[T]
+    count: int
+    is_exact_count: bool
+    next_cursor: str | None = None
+    next: str | None = None
@@ -0,0 +1,17 @@
+import uuid
+
+from app.schemas.base import BaseSchema
+
+
+class Principal(BaseSchema):
+    """
+    Authenticated user of a device session
+
+    Small enough to be cached, so that authenticating
+    a request doesn't have to load the user from the db
+    """
+
+    id: uuid.UUID
+    is_active: bool
+    is_admin: bool
+    device_verified: bool
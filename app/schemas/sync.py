@@ -0,0 +1,43 @@
+from typing import Annotated, Literal
+
+from pydantic import Field
+
+from app.schemas.base import BaseSchema
+from app.schemas.cipher import Cipher
+from app.schemas.collection import Collection
+from app.schemas.tombstone import Tombstone
+
+
+class VaultChanges(BaseSchema):
+    """
+    Vault changes since a revision
+
+    revision: current vault revision, to be sent as `since` on the next sync
+    is_full: the whole vault is returned, client should drop its local copy
+    """
+
+    revision: int
+    is_full: bool
+    ciphers: list[Cipher]
+    collections: list[Collection]
+    tombstones: list[Tombstone]
+
+
+class SyncAck(BaseSchema):
+    """Sync socket client message, changes up to revision were applied"""
+
+    type: Literal["ack"]
+    revision: int = Field(ge=0)
+
+
+class SyncChangesRequest(BaseSchema):
+    """
+    Sync socket client message, request the vault changes since a revision
+    (defaults to the last acknowledged revision)
+    """
+
+    type: Literal["changes"]
+    since: int | None = Field(None, ge=0)
+
+
+SyncClientMessage = Annotated[SyncAck | SyncChangesRequest, Field(discriminator="type")]
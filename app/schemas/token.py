@@ -5,9 +5,11 @@ from typing import Self
 from pydantic import Field, IPvAnyAddress, field_serializer
 
 from app.core import security
+from app.core.config import settings
 from app.schemas import BaseSchema
 from app.schemas.enums import TokenType
 from app.utils.helpers import to_int_timestamp, to_str
+from app.utils.lru import TTLLRUCache
 
 """
 JWT: JWT Token Schema
@@ -20,6 +22,11 @@ JWT:
     ip: IP Address
 """
 
+# Per worker cache of verified token claims, keyed by (claim class, token digest)
+verified_claims: TTLLRUCache[tuple[type, str], "TokenBase"] = TTLLRUCache(
+    settings.VERIFIED_TOKENS_CACHE_SIZE
+)
+
 
 class TokenBase(BaseSchema):
     type: TokenType
@@ -36,9 +43,20 @@ class TokenBase(BaseSchema):
 
     @classmethod
     def from_encoded(cls, token: str, *, allow_expired: bool = False) -> Self:
-        """Create a token object from an encoded token string"""
-        claim = security.decode_token(token, allow_expired=allow_expired)
-        return cls.model_validate(claim)
+        """
+        Create a token object from an encoded token string
+
+        Verified claims are cached till they expire,
+        so a token presented again skips signature verification & validation.
+        The returned claim may be shared, it must not be mutated.
+        """
+        key = (cls, security.sha256_hash(token.encode()))
+        if (cached := verified_claims.get(key)) is not None:
+            return cached  # type: ignore
+
+        claim = cls.model_validate(security.decode_token(token, allow_expired=allow_expired))
+        verified_claims.set(key, claim, expires_at=claim.exp.timestamp())
+        return claim
 
 
 class AccessTokenClaim(TokenBase):
@@ -0,0 +1,23 @@
+import datetime as dt
+import uuid
+
+from pydantic import ConfigDict
+
+from app.schemas.base import BaseSchema
+from app.schemas.enums import VaultEntity
+
+
+class TombstoneCreate(BaseSchema):
+    id: uuid.UUID
+    user_id: uuid.UUID
+    type: VaultEntity
+    revision: int
+
+
+class Tombstone(BaseSchema):
+    id: uuid.UUID
+    type: VaultEntity
+    revision: int
+    deleted_at: dt.datetime
+
+    model_config = ConfigDict(from_attributes=True)
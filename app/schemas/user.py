@@ -2,23 +2,17 @@ import datetime as dt
 import uuid
 from typing import Self
 
-from pydantic import ConfigDict, EmailStr, computed_field, model_validator
+from pydantic import ConfigDict, EmailStr, model_validator
 
-from app.core.security import hash_pwd
 from app.schemas.base import BaseSchema
-from app.utils.regex import generate_password
 
 
 class UserInvite(BaseSchema):
+    """Invited users get an auto generated password (see `UserRepo.create`)"""
+
     email: EmailStr
     is_admin: bool = False
 
-    @computed_field(description="Auto generated password on invitation")
-    @property
-    def master_pwd_hash(self) -> str:
-        pwd = generate_password()
-        return hash_pwd(pwd)
-
 
 class UserLogin(BaseSchema):
     email: EmailStr
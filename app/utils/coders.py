@@ -2,6 +2,7 @@ import datetime as dt
 import json
 from typing import Any
 
+import msgpack
 from fastapi.encoders import jsonable_encoder
 from starlette.responses import JSONResponse
 
@@ -61,3 +62,19 @@ class JsonCoder:
     @classmethod
     def decode(cls, value: bytes) -> Any:
         return json.loads(value, object_hook=object_hook)
+
+
+class MsgPackCoder:
+    """
+    MessagePack coder for encoding and decoding values.
+    Binary & more compact than json,
+    types unsupported by MessagePack are encoded as their json representation
+    """
+
+    @classmethod
+    def encode(cls, value: Any) -> bytes:
+        return msgpack.packb(value, default=jsonable_encoder)
+
+    @classmethod
+    def decode(cls, value: bytes) -> Any:
+        return msgpack.unpackb(value)
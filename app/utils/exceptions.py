@@ -94,6 +94,32 @@ class DuplicateEntityException(HTTPException):
         super().__init__(status_code=status.HTTP_409_CONFLICT, detail=f"{entity} already exists")
 
 
+class InvalidCursorException(HTTPException):
+    def __init__(self) -> None:
+        super().__init__(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor",
+        )
+
+
+class TooManyRequestsException(HTTPException):
+    def __init__(self, detail: str = "Too many requests", retry_after: int = 1) -> None:
+        super().__init__(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=detail,
+            headers={"Retry-After": str(retry_after)},
+        )
+
+
+class ServiceUnavailableException(HTTPException):
+    def __init__(self, retry_after: int = 1) -> None:
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server is busy, try again later",
+            headers={"Retry-After": str(retry_after)},
+        )
+
+
 class InvalidFileTypeException(HTTPException):
     def __init__(self, type: str | None = None) -> None:
         expected_statement = f"Expected {type} file" if type else ""
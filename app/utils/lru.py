@@ -0,0 +1,78 @@
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from typing import NamedTuple
+
+
+class CacheStats(NamedTuple):
+    hits: int
+    misses: int
+    size: int
+    maxsize: int
+
+
+class TTLLRUCache[K: Hashable, V]:
+    """
+    Bounded in memory LRU cache with a per entry expiry.
+
+    Least recently used entries are evicted when the cache is full,
+    expired entries are evicted on access.
+    Not thread safe, meant to be used from the event loop of a single worker.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        *,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        if maxsize <= 0:
+            raise ValueError("maxsize must be positive")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._clock = clock
+        self._data: OrderedDict[K, tuple[V, float]] = OrderedDict()
+
+    def get(self, key: K) -> V | None:
+        """Get value of key if cached & not expired else None"""
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        value, expires_at = entry
+        if expires_at <= self._clock():
+            del self._data[key]
+            self.misses += 1
+            return None
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: K, value: V, *, expires_at: float) -> None:
+        """Cache value of key till expires_at (unix timestamp)"""
+        if expires_at <= self._clock():
+            return
+        self._data[key] = (value, expires_at)
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all entries & reset counters"""
+        self._data.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> CacheStats:
+        return CacheStats(
+            hits=self.hits,
+            misses=self.misses,
+            size=len(self._data),
+            maxsize=self.maxsize,
+        )
+
+    def __len__(self) -> int:
+        return len(self._data)
@@ -0,0 +1,109 @@
+from collections.abc import Iterable
+from functools import lru_cache
+from typing import Any
+
+from pydantic import TypeAdapter
+from starlette.background import BackgroundTask
+from starlette.responses import Response
+
+from app.utils.coders import MsgPackCoder
+
+JSON_MEDIA_TYPE = "application/json"
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+MSGPACK_MEDIA_TYPES = (MSGPACK_MEDIA_TYPE, "application/x-msgpack")
+
+
+@lru_cache
+def get_adapter(type_: Any) -> TypeAdapter:
+    """Returns the (cached) type adapter of a schema type, e.g. list[schemas.Cipher]"""
+    return TypeAdapter(type_)
+
+
+def validate_rows[T](type_: type[T], rows: Iterable[Any]) -> list[T]:
+    """Validates db rows into a list of schemas in a single pass (rather than row by row)"""
+    return get_adapter(list[type_]).validate_python(list(rows), from_attributes=True)
+
+
+def negotiate_media_type(accept: str | None) -> str:
+    """
+    Returns the response media type accepted by the client (Accept header),
+    MessagePack if preferred over (or as much as) json, else json
+    """
+    json_q = msgpack_q = 0.0
+    for media_range in (accept or JSON_MEDIA_TYPE).split(","):
+        media_type, *params = (part.strip() for part in media_range.split(";"))
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        media_type = media_type.lower()
+        if media_type in MSGPACK_MEDIA_TYPES:
+            msgpack_q = max(msgpack_q, q)
+        elif media_type in (JSON_MEDIA_TYPE, "application/*", "*/*"):
+            json_q = max(json_q, q)
+    if msgpack_q > 0 and msgpack_q >= json_q:
+        return MSGPACK_MEDIA_TYPE
+    return JSON_MEDIA_TYPE
+
+
+class SchemaResponse(Response):
+    """
+    JSON response of a schema value serialized in a single pass by pydantic-core.
+
+    Skips the validation against the response model & `jsonable_encoder`
+    of the default response path, with the same output bytes.
+    The route should declare its `response_model` for the docs.
+
+    Usage:
+        return SchemaResponse(page, type_=schemas.Page[schemas.Cipher])
+    """
+
+    media_type = JSON_MEDIA_TYPE
+
+    def __init__(
+        self,
+        content: Any,
+        *,
+        type_: Any,
+        status_code: int = 200,
+        headers: dict[str, str] | None = None,
+        background: BackgroundTask | None = None,
+    ) -> None:
+        self.adapter = get_adapter(type_)
+        super().__init__(content, status_code=status_code, headers=headers, background=background)
+
+    def render(self, content: Any) -> bytes:
+        return self.adapter.dump_json(content)
+
+
+class MsgPackSchemaResponse(SchemaResponse):
+    """
+    MessagePack response of a schema value.
+    Bytes (e.g. encrypted cipher data) are sent raw rather than as json strings.
+    """
+
+    media_type = MSGPACK_MEDIA_TYPE
+
+    def render(self, content: Any) -> bytes:
+        return MsgPackCoder.encode(self.adapter.dump_python(content))
+
+
+def schema_response(
+    content: Any,
+    *,
+    type_: Any,
+    media_type: str = JSON_MEDIA_TYPE,
+    status_code: int = 200,
+) -> SchemaResponse:
+    """Returns the schema response of the negotiated media type (see `negotiate_media_type`)"""
+    response_class = MsgPackSchemaResponse if media_type == MSGPACK_MEDIA_TYPE else SchemaResponse
+    return response_class(
+        content,
+        type_=type_,
+        status_code=status_code,
+        headers={"Vary": "Accept"},
+    )
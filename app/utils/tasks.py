@@ -0,0 +1,19 @@
+import asyncio
+from collections.abc import Coroutine
+from typing import Any
+
+_background_tasks: set[asyncio.Task] = set()
+
+
+def spawn(coro: Coroutine[Any, Any, Any]) -> asyncio.Task:
+    """
+    Run coroutine in a background task
+
+    Keeps a reference to the task till it is done,
+    so it isn't garbage collected midway.
+    Safe to call from cleanup code of cancelled tasks.
+    """
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    return task
@@ -28,6 +28,8 @@ else:
     web_concurrency = max(int(default_web_concurrency), 2)
     if use_max_workers:
         web_concurrency = min(web_concurrency, use_max_workers)
+# Workers inherit it, to split the db connections budget between them
+os.environ["WEB_CONCURRENCY"] = str(web_concurrency)
 accesslog_var = os.getenv("ACCESS_LOG", "-")
 use_accesslog = accesslog_var or None
 errorlog_var = os.getenv("ERROR_LOG", "-")
@@ -48,6 +50,14 @@ timeout = int(timeout_str)
 keepalive = int(keepalive_str)
 
 
+def child_exit(server, worker):
+    """Drop the live gauges of exited workers (prometheus multiprocess mode)"""
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
+
+
 # For debugging and testing
 log_data = {
     "loglevel": loglevel,
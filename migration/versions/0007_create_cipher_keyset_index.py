@@ -0,0 +1,29 @@
+"""create_cipher_keyset_index
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18 10:12:31.204118
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Create cipher (user_id, created_at, id) index for keyset pagination"""
+    op.create_index(
+        op.f("ix_cipher_user_id_created_at_id"),
+        "cipher",
+        ["user_id", "created_at", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Drop cipher keyset pagination index"""
+    op.drop_index(op.f("ix_cipher_user_id_created_at_id"), table_name="cipher")
@@ -0,0 +1,62 @@
+"""create_vault_revision
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18 11:02:47.531920
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+from app.models.enums import PgVaultEntity
+
+# revision identifiers, used by Alembic.
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    Add vault revision to user, cipher & collection tables
+    Create tombstone table
+
+    Existing vaults start at revision 1 so that syncing since 0 includes them
+    """
+    op.add_column("user", sa.Column("revision", sa.BigInteger(), server_default="0", nullable=False))
+    op.add_column("cipher", sa.Column("revision", sa.BigInteger(), server_default="0", nullable=False))
+    op.add_column("collection", sa.Column("revision", sa.BigInteger(), server_default="0", nullable=False))
+
+    op.execute('UPDATE "user" SET revision = 1')
+    op.execute("UPDATE cipher SET revision = 1")
+    op.execute("UPDATE collection SET revision = 1")
+
+    op.create_index(op.f("ix_cipher_user_id_revision"), "cipher", ["user_id", "revision"], unique=False)
+    op.create_index(op.f("ix_collection_user_id_revision"), "collection", ["user_id", "revision"], unique=False)
+
+    op.create_table(
+        "tombstone",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("user_id", sa.UUID(), nullable=False),
+        sa.Column("type", PgVaultEntity, nullable=False),
+        sa.Column("revision", sa.BigInteger(), nullable=False),
+        sa.Column("deleted_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["user.id"], name=op.f("fk_tombstone_user_id_user")),
+        sa.PrimaryKeyConstraint("id", name=op.f("pk_tombstone")),
+    )
+    op.create_index(op.f("ix_tombstone_user_id_revision"), "tombstone", ["user_id", "revision"], unique=False)
+
+
+def downgrade() -> None:
+    """Drop tombstone table & vault revision columns"""
+    op.drop_index(op.f("ix_tombstone_user_id_revision"), table_name="tombstone")
+    op.drop_table("tombstone")
+    PgVaultEntity.drop(op.get_bind(), checkfirst=True)
+
+    op.drop_index(op.f("ix_collection_user_id_revision"), table_name="collection")
+    op.drop_index(op.f("ix_cipher_user_id_revision"), table_name="cipher")
+
+    op.drop_column("collection", "revision")
+    op.drop_column("cipher", "revision")
+    op.drop_column("user", "revision")
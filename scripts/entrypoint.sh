@@ -13,6 +13,9 @@ alembic upgrade head
 # Run db seed
 python3 ./app/db/seed.py
 
+# Backfill redis indexes
+python3 ./app/cache/backfill.py
+
 # Start the server
 # $@ is the command line arguments passed to the script
 # $@ is the command in the CMD directive in the Dockerfile
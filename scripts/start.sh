@@ -20,6 +20,11 @@ export APP_MODULE="$MODULE_NAME:app"
 HOST=${HOST?backend host undefined}
 PORT=${BACKEND_DEV_PORT?PORT undefined}
 
+# Prometheus metrics shared by the workers, stale samples are cleared on start
+export PROMETHEUS_MULTIPROC_DIR=${PROMETHEUS_MULTIPROC_DIR:-"/tmp/prometheus"}
+rm -rf "$PROMETHEUS_MULTIPROC_DIR"
+mkdir -p "$PROMETHEUS_MULTIPROC_DIR"
+
 GUNICORN_CONF=${GUNICORN_CONF:-"gunicorn_conf.py"}
 WORKER_CLASS=${WORKER_CLASS:-"uvicorn.workers.UvicornWorker"}
 
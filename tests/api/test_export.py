@@ -0,0 +1,64 @@
+import asyncio
+import datetime as dt
+import gzip
+import json
+import uuid
+from collections.abc import AsyncIterator
+
+from app.api.routes.v1.export import _buffered, _gzipped, _line
+from app.schemas import Collection
+from app.schemas.enums import VaultEntity
+
+
+async def iterate(chunks: list[bytes]) -> AsyncIterator[bytes]:
+    for chunk in chunks:
+        yield chunk
+
+
+async def collect(chunks: AsyncIterator[bytes]) -> list[bytes]:
+    return [chunk async for chunk in chunks]
+
+
+def test_line():
+    collection = Collection(
+        id=uuid.uuid4(),
+        user_id=uuid.uuid4(),
+        name='Coffre "fort"\n🔐',
+        created_at=dt.datetime.now(dt.UTC),
+        revision=1,
+    )
+
+    line = _line(VaultEntity.COLLECTION, collection)
+
+    assert line.endswith(b"\n")
+    assert line.count(b"\n") == 1
+    assert json.loads(line) == {
+        "type": VaultEntity.COLLECTION,
+        "data": json.loads(collection.model_dump_json()),
+    }
+
+
+def test_buffered_merges_chunks():
+    chunks = [b"a" * 3, b"b" * 3, b"c" * 3, b"d" * 2]
+
+    buffered = asyncio.run(collect(_buffered(iterate(chunks), size=5)))
+
+    # Flushed once at least size bytes are buffered, then the last partial buffer
+    assert buffered == [b"aaabbb", b"cccdd"]
+
+
+def test_buffered_flushes_last_partial_buffer():
+    buffered = asyncio.run(collect(_buffered(iterate([b"ab", b"c"]), size=5)))
+    assert buffered == [b"abc"]
+
+
+def test_buffered_empty():
+    assert asyncio.run(collect(_buffered(iterate([]), size=5))) == []
+
+
+def test_gzipped_round_trip():
+    chunks = [b'{"type":"cipher"}\n' * 100, b"", b'{"type":"collection"}\n']
+
+    compressed = asyncio.run(collect(_gzipped(iterate(chunks))))
+
+    assert gzip.decompress(b"".join(compressed)) == b"".join(chunks)
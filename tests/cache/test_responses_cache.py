@@ -0,0 +1,93 @@
+import asyncio
+import uuid
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.cache import keys
+from app.cache.service.responses import GENERATION_FIELD, ResponsesService
+
+
+class MockRedis:
+    """In memory redis hashes, running the save script as SAVE_LUA does"""
+
+    def __init__(self) -> None:
+        self.hashes: dict[str, dict[str, str | bytes]] = {}
+
+    async def hmget(self, key: str, *fields: str) -> list:
+        return [self.hashes.get(key, {}).get(field) for field in fields]
+
+    def pipeline(self, transaction: bool = True) -> MagicMock:
+        pipe = MagicMock()
+        pipe.unlink.side_effect = lambda key: self.hashes.pop(key, None)
+        pipe.hset.side_effect = lambda key, field, value: self.hashes.setdefault(key, {}).update(
+            {field: value}
+        )
+        pipe.execute = AsyncMock()
+        pipeline = MagicMock()
+        pipeline.__aenter__.return_value = pipe
+        return pipeline
+
+    async def save_script(self, *, keys: list[str], args: list, client) -> int:
+        generation, name, response, _ = args
+        fields = self.hashes.setdefault(keys[0], {})
+        if fields.get(GENERATION_FIELD, "") != generation:
+            return 0
+        fields[name] = response
+        return 1
+
+
+@pytest.fixture
+def rc() -> MockRedis:
+    return MockRedis()
+
+
+@pytest.fixture
+def service(rc: MockRedis, monkeypatch: pytest.MonkeyPatch) -> ResponsesService:
+    service = ResponsesService()
+    monkeypatch.setattr(service, "_save_script", rc.save_script)
+    return service
+
+
+def test_save_and_get(rc: MockRedis, service: ResponsesService):
+    user_id = uuid.uuid4()
+
+    async def run():
+        cached, generation = await service.get(rc, user_id=user_id, name="collections")
+        assert cached is None
+        assert await service.save(
+            rc, user_id=user_id, name="collections", response=b"[]", generation=generation
+        )
+        return await service.get(rc, user_id=user_id, name="collections")
+
+    cached, _ = asyncio.run(run())
+    assert cached == b"[]"
+
+
+def test_save_skipped_after_invalidation(rc: MockRedis, service: ResponsesService):
+    user_id = uuid.uuid4()
+
+    async def run():
+        # Response loaded, then the vault changes before it is saved
+        _, generation = await service.get(rc, user_id=user_id, name="collections")
+        await service.invalidate(rc, user_id=user_id)
+        saved = await service.save(
+            rc, user_id=user_id, name="collections", response=b"[stale]", generation=generation
+        )
+        return saved, await service.get(rc, user_id=user_id, name="collections")
+
+    saved, (cached, generation) = asyncio.run(run())
+    assert not saved
+    assert cached is None
+    assert generation == rc.hashes[keys.responses(user_id)][GENERATION_FIELD]
+
+
+def test_invalidate_drops_cached_responses(rc: MockRedis, service: ResponsesService):
+    user_id = uuid.uuid4()
+    rc.hashes[keys.responses(user_id)] = {GENERATION_FIELD: "gen", "collections": b"[]"}
+
+    asyncio.run(service.invalidate(rc, user_id=user_id))
+
+    fields = rc.hashes[keys.responses(user_id)]
+    assert "collections" not in fields
+    assert fields[GENERATION_FIELD] != "gen"
@@ -0,0 +1,35 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.core.hashing import HashingPool
+from app.core.security import hash_pwd, verify_pwd
+from app.utils.exceptions import ServiceUnavailableException
+
+
+def test_hashing_pool_run():
+    pool = HashingPool(max_workers=1, max_pending=1)
+    pwd_hash = asyncio.run(pool.run(hash_pwd, "password"))
+    pool.shutdown()
+
+    assert verify_pwd("password", pwd_hash)
+    assert pool.pending == 0
+
+
+def test_hashing_pool_saturated():
+    pool = HashingPool(max_workers=1, max_pending=1)
+    release = threading.Event()
+
+    async def main():
+        blocked = asyncio.create_task(pool.run(release.wait))
+        await asyncio.sleep(0)
+        with pytest.raises(ServiceUnavailableException):
+            await pool.run(hash_pwd, "password")
+        release.set()
+        await blocked
+
+    asyncio.run(main())
+    pool.shutdown()
+
+    assert pool.pending == 0
@@ -0,0 +1,12 @@
+from prometheus_client import CONTENT_TYPE_LATEST
+
+from app.core import metrics
+
+
+def test_render():
+    metrics.HTTP_REQUEST_SECONDS.labels("GET", "/v1/secrets/", 200).observe(0.01)
+
+    data, content_type = metrics.render()
+
+    assert content_type == CONTENT_TYPE_LATEST
+    assert b'http_request_seconds_count{method="GET",route="/v1/secrets/",status="200"}' in data
@@ -0,0 +1,21 @@
+from app.db.pool import pool_sizing
+
+
+def test_pool_sizing_without_budget():
+    assert pool_sizing(pool_size=50, max_overflow=10) == (50, 10)
+    assert pool_sizing(pool_size=50, max_overflow=10, workers=8) == (50, 10)
+
+
+def test_pool_sizing_splits_budget():
+    size, overflow = pool_sizing(pool_size=50, max_overflow=10, budget=200, workers=8)
+    assert (size, overflow) == (25, 0)
+    assert (size + overflow) * 8 <= 200
+
+
+def test_pool_sizing_budget_leaves_overflow():
+    assert pool_sizing(pool_size=20, max_overflow=10, budget=100, workers=4) == (20, 5)
+    assert pool_sizing(pool_size=20, max_overflow=10, budget=400, workers=4) == (20, 10)
+
+
+def test_pool_sizing_at_least_one_connection():
+    assert pool_sizing(pool_size=50, max_overflow=10, budget=4, workers=8) == (1, 0)
@@ -0,0 +1,36 @@
+import sqlalchemy as sa
+
+from app.db.session import (
+    HAS_WRITTEN,
+    REPLICA,
+    AsyncSessionFactory,
+    async_engine,
+    read_from_primary,
+    reads_from_replica,
+)
+
+
+def test_reads_from_replica():
+    assert not reads_from_replica(AsyncSessionFactory())
+    assert not reads_from_replica(AsyncSessionFactory(info={REPLICA: None}))
+
+    db = AsyncSessionFactory(info={REPLICA: async_engine})
+    assert reads_from_replica(db)
+
+    read_from_primary(db)
+    assert not reads_from_replica(db)
+    assert db.sync_session.get_bind() is async_engine.sync_engine
+
+
+def test_writes_are_tracked():
+    db = AsyncSessionFactory()
+    db.sync_session.get_bind(clause=sa.select(sa.literal(1)))
+    assert not db.info.get(HAS_WRITTEN)
+
+    db.sync_session.get_bind(clause=sa.text("SELECT 1"))
+    assert not db.info.get(HAS_WRITTEN)
+
+    db.sync_session.get_bind(
+        clause=sa.update(sa.table("user", sa.column("revision"))).values(revision=1)
+    )
+    assert db.info.get(HAS_WRITTEN)
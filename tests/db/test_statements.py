@@ -0,0 +1,52 @@
+from app.db.statements import StatementCacheStats, statement_cache_connect_args
+
+
+def test_statement_cache_stats():
+    stats = StatementCacheStats()
+    assert stats.hit_rate == 0.0
+
+    names = {stats.statement_name() for _ in range(2)}
+    stats.executions = 8
+
+    assert len(names) == 2
+    assert stats.misses == 2
+    assert stats.hits == 6
+    assert stats.hit_rate == 0.75
+
+
+def test_connect_args_direct():
+    stats = StatementCacheStats()
+    args = statement_cache_connect_args(
+        stats,
+        pgbouncer=False,
+        pgbouncer_prepared_statements=False,
+        cache_size=500,
+    )
+    assert args == {
+        "prepared_statement_name_func": stats.statement_name,
+        "prepared_statement_cache_size": 500,
+    }
+
+
+def test_connect_args_pgbouncer():
+    stats = StatementCacheStats()
+    args = statement_cache_connect_args(
+        stats,
+        pgbouncer=True,
+        pgbouncer_prepared_statements=False,
+        cache_size=500,
+    )
+    assert args["prepared_statement_cache_size"] == 0
+    assert args["statement_cache_size"] == 0
+
+
+def test_connect_args_pgbouncer_prepared_statements():
+    stats = StatementCacheStats()
+    args = statement_cache_connect_args(
+        stats,
+        pgbouncer=True,
+        pgbouncer_prepared_statements=True,
+        cache_size=500,
+    )
+    assert args["prepared_statement_cache_size"] == 500
+    assert args["statement_cache_size"] == 0
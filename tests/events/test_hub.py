@@ -0,0 +1,30 @@
+import asyncio
+
+from app.events.hub import Subscription
+
+
+async def collect(subscription: Subscription) -> list[str]:
+    return [data async for data in subscription]
+
+
+def test_subscription_iterates_till_closed():
+    async def main():
+        subscription = Subscription("channel", maxsize=2)
+        subscription.put("a")
+        subscription.put("b")
+        task = asyncio.create_task(collect(subscription))
+        await asyncio.sleep(0)
+        subscription.close()
+        return await task
+
+    assert asyncio.run(main()) == ["a", "b"]
+
+
+def test_subscription_closed_on_overflow():
+    async def main():
+        subscription = Subscription("channel", maxsize=1)
+        subscription.put("a")
+        subscription.put("b")
+        return subscription.closed, await collect(subscription)
+
+    assert asyncio.run(main()) == (True, [])
@@ -0,0 +1,90 @@
+import asyncio
+import datetime as dt
+import uuid
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app import cache
+from app.events import notifier as notifier_module
+from app.events.notifier import Notifier, compact
+from app.events.sync_data import SyncData
+from app.schemas import Collection
+from app.schemas.enums import Op
+
+
+def id_event(action: Op) -> SyncData:
+    return SyncData(action=action, data=uuid.uuid4(), type="id")
+
+
+def collection_event(action: Op) -> SyncData:
+    collection = Collection(
+        id=uuid.uuid4(),
+        user_id=uuid.uuid4(),
+        name="collection",
+        created_at=dt.datetime.now(dt.UTC),
+        revision=1,
+    )
+    return SyncData(action=action, data=collection, type="collection")
+
+
+def test_compact_below_threshold():
+    events = [id_event(Op.DELETE), id_event(Op.DELETE)]
+    assert compact(events, threshold=2) == events
+
+
+def test_compact_above_threshold():
+    events = [id_event(Op.DELETE) for _ in range(3)]
+    compacted = compact(events, threshold=2)
+
+    assert len(compacted) == 1
+    assert compacted[0].type == "ids"
+    assert compacted[0].action == Op.DELETE
+    assert compacted[0].data == [event.data for event in events]
+
+
+def test_compact_keeps_order_across_actions():
+    deleted = collection_event(Op.DELETE)
+    soft_deleted = SyncData(
+        action=Op.SOFT_DELETE,
+        data=[uuid.uuid4() for _ in range(3)],
+        type="ids",
+    )
+    created = id_event(Op.CREATE)
+    events = [deleted, soft_deleted, created]
+
+    assert compact(events, threshold=2) == events
+
+
+def test_compact_skips_collections():
+    events = [collection_event(Op.DELETE) for _ in range(3)]
+    assert compact(events, threshold=2) == events
+
+
+def test_flush_invalidates_cached_responses_before_publishing(monkeypatch: pytest.MonkeyPatch):
+    calls: list[tuple[str, uuid.UUID]] = []
+
+    async def invalidate(rc, *, user_id):
+        calls.append(("invalidate", user_id))
+
+    async def publish(rc, *, user_id, payload):
+        calls.append(("publish", user_id))
+
+    monkeypatch.setattr(cache.responses, "invalidate", AsyncMock(side_effect=invalidate))
+    monkeypatch.setattr(notifier_module, "publish", AsyncMock(side_effect=publish))
+
+    user_id, other_user_id = uuid.uuid4(), uuid.uuid4()
+    notifier = Notifier(MagicMock())
+    notifier.add(user_id=user_id, data=uuid.uuid4(), action=Op.DELETE)
+    notifier.add(user_id=user_id, data=uuid.uuid4(), action=Op.DELETE)
+    notifier.add(user_id=other_user_id, data=uuid.uuid4(), action=Op.CREATE)
+
+    asyncio.run(notifier.flush())
+    asyncio.run(notifier.flush())  # nothing left to notify
+
+    assert calls == [
+        ("invalidate", user_id),
+        ("publish", user_id),
+        ("invalidate", other_user_id),
+        ("publish", other_user_id),
+    ]
@@ -0,0 +1,68 @@
+import asyncio
+import uuid
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.core.config import settings
+from app.events.stream import parse_id, replay, unframe
+
+
+def mock_redis(*, oldest: list, entries: list) -> MagicMock:
+    """Redis client whose pipeline returns the given xrange results"""
+    pipe = MagicMock()
+    pipe.execute = AsyncMock(return_value=[oldest, entries])
+    rc = MagicMock()
+    rc.pipeline.return_value.__aenter__.return_value = pipe
+    return rc
+
+
+def stream_entries(start: int, count: int) -> list:
+    return [(f"1700000000000-{i}", {"data": f'{{"i": {i}}}'}) for i in range(start, start + count)]
+
+
+@pytest.mark.parametrize(
+    "entry_id, expected",
+    [
+        ("1700000000000-0", (1700000000000, 0)),
+        ("1700000000000-12", (1700000000000, 12)),
+        ("1700000000000", (1700000000000, 0)),
+        ("invalid", None),
+        ("", None),
+    ],
+)
+def test_parse_id(entry_id: str, expected: tuple[int, int] | None):
+    assert parse_id(entry_id) == expected
+
+
+def test_parse_id_order():
+    assert parse_id("1700000000000-2") > parse_id("1700000000000-1")  # type: ignore
+    assert parse_id("1700000000001-0") > parse_id("1700000000000-9")  # type: ignore
+
+
+def test_unframe():
+    assert unframe('1700000000000-0\n{"a": 1}') == ("1700000000000-0", '{"a": 1}')
+    assert unframe('{"a": 1}') == (None, '{"a": 1}')
+
+
+def test_replay():
+    rc = mock_redis(oldest=stream_entries(0, 1), entries=stream_entries(6, 2))
+    events = asyncio.run(replay(rc, user_id=uuid.uuid4(), after="1700000000000-5"))
+    assert events == [("1700000000000-6", '{"i": 6}'), ("1700000000000-7", '{"i": 7}')]
+
+
+def test_replay_trimmed():
+    rc = mock_redis(oldest=stream_entries(6, 1), entries=stream_entries(6, 2))
+    assert asyncio.run(replay(rc, user_id=uuid.uuid4(), after="1700000000000-5")) is None
+
+
+def test_replay_more_than_max_len():
+    # Approximate trimming (MAXLEN ~) may keep more than max len entries
+    entries = stream_entries(1, settings.SYNC_STREAM_MAX_LEN + 1)
+    rc = mock_redis(oldest=stream_entries(0, 1), entries=entries)
+    assert asyncio.run(replay(rc, user_id=uuid.uuid4(), after="1700000000000-0")) is None
+
+
+def test_replay_invalid_id():
+    rc = mock_redis(oldest=[], entries=[])
+    assert asyncio.run(replay(rc, user_id=uuid.uuid4(), after="invalid")) is None
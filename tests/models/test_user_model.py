@@ -1,3 +1,5 @@
+import asyncio
+
 from app.core import security
 from app.models.user import User
 
@@ -5,7 +7,7 @@ from app.models.user import User
 def test_update_password() -> None:
     user = User()
     master_key_hash = "mock_pwd"
-    user.update_password(master_key_hash)
+    asyncio.run(user.update_password(master_key_hash))
     assert security.verify_pwd(master_key_hash, user.master_pwd_hash)
 
 
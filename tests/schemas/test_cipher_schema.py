@@ -0,0 +1,24 @@
+import uuid
+
+import pytest
+from pydantic import ValidationError
+
+from app.schemas.cipher import CipherBulkWrite, CipherCreate
+from app.schemas.enums import CipherType
+
+
+def test_cipher_bulk_write_defaults():
+    bulk_write = CipherBulkWrite()
+    assert bulk_write.create == []
+    assert bulk_write.update == []
+
+
+def test_cipher_bulk_write_update_unset_fields():
+    bulk_write = CipherBulkWrite.model_validate({"update": [{"id": str(uuid.uuid4())}]})
+    assert bulk_write.update[0].model_fields_set == {"id"}
+
+
+def test_cipher_bulk_write_max_length():
+    new_cipher = CipherCreate(type=CipherType.NOTE, data=b"test")
+    with pytest.raises(ValidationError):
+        CipherBulkWrite(create=[new_cipher] * 1001)
@@ -0,0 +1,30 @@
+import datetime as dt
+import uuid
+
+import pytest
+
+from app.schemas.pagination import Cursor, Page
+from app.utils.exceptions import InvalidCursorException
+
+
+def test_cursor_encode_decode():
+    cursor = Cursor(created_at=dt.datetime.now(dt.UTC), id=uuid.uuid4())
+    token = cursor.encode()
+    assert isinstance(token, str)
+    assert Cursor.decode(token) == cursor
+
+
+def test_cursor_decode_invalid():
+    with pytest.raises(InvalidCursorException):
+        Cursor.decode("invalid")
+
+
+def test_cursor_decode_invalid_payload():
+    with pytest.raises(InvalidCursorException):
+        Cursor.decode(Cursor(created_at=dt.datetime.now(dt.UTC), id=uuid.uuid4()).encode()[:-8])
+
+
+def test_page_last_page():
+    page = Page[int](items=[1, 2], count=2, is_exact_count=True)
+    assert page.next_cursor is None
+    assert page.next is None
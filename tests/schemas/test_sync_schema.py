@@ -0,0 +1,30 @@
+import pytest
+from pydantic import TypeAdapter, ValidationError
+
+from app.schemas import SyncAck, SyncChangesRequest, SyncClientMessage
+
+adapter = TypeAdapter(SyncClientMessage)
+
+
+def test_sync_client_message_ack():
+    message = adapter.validate_python({"type": "ack", "revision": 3})
+    assert message == SyncAck(type="ack", revision=3)
+
+
+def test_sync_client_message_changes():
+    message = adapter.validate_python({"type": "changes"})
+    assert message == SyncChangesRequest(type="changes", since=None)
+
+
+@pytest.mark.parametrize(
+    "message",
+    [
+        {"type": "unknown"},
+        {"type": "ack"},
+        {"type": "ack", "revision": -1},
+        {"type": "changes", "since": -1},
+    ],
+)
+def test_sync_client_message_invalid(message: dict):
+    with pytest.raises(ValidationError):
+        adapter.validate_python(message)
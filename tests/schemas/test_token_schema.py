@@ -1,7 +1,7 @@
 import pytest
 
 from app.core.security import encode_token
-from app.schemas.token import AccessTokenClaim, TokenBase
+from app.schemas.token import AccessTokenClaim, TokenBase, verified_claims
 
 
 def test_token_base_from_encoded(mock_access_token_claim: AccessTokenClaim):
@@ -20,3 +20,14 @@ def test_token_base_from_encoded_allow_expired(mock_expired_access_token_claim:
     token = encode_token(mock_expired_access_token_claim.model_dump())
     access_token_claim = AccessTokenClaim.from_encoded(token, allow_expired=True)
     assert access_token_claim.model_dump() == mock_expired_access_token_claim.model_dump()
+
+
+def test_token_base_from_encoded_cached(mock_access_token_claim: AccessTokenClaim):
+    token = encode_token(mock_access_token_claim.model_dump())
+    hits = verified_claims.hits
+
+    first = AccessTokenClaim.from_encoded(token)
+    second = AccessTokenClaim.from_encoded(token)
+
+    assert second is first
+    assert verified_claims.hits == hits + 1
@@ -3,12 +3,13 @@ import pytest
 from app.schemas.user import UserInvite, UserResetPassword
 
 
-def test_user_invite_auto_pass():
+def test_user_invite_dump():
     invite = UserInvite(
         email="test@example.com",
         is_admin=False,
     )
-    assert invite.master_pwd_hash is not None
+    # Password is generated & hashed in the hashing pool on creation (see `UserRepo`)
+    assert invite.model_dump() == {"email": "test@example.com", "is_admin": False}
 
 
 def test_user_reset_pwd_auto_pass():
@@ -1,10 +1,11 @@
 import datetime as dt
 import json
+import uuid
 
 import pytest
 from starlette.responses import JSONResponse
 
-from app.utils.coders import JsonCoder, JsonEncoder, object_hook
+from app.utils.coders import JsonCoder, JsonEncoder, MsgPackCoder, object_hook
 
 
 def test_json_encoder():
@@ -69,3 +70,17 @@ def test_json_coder():
     encoded_json_response: bytes = JsonCoder.encode(json_response)
     decoded_json_response: dict = JsonCoder.decode(encoded_json_response)
     assert decoded_json_response == json.loads(json_response.body)
+
+
+def test_msgpack_coder():
+    value = {"key": "value", "list": [1, 2.5, None, True], "bytes": b"data"}
+    encoded = MsgPackCoder.encode(value)
+    assert isinstance(encoded, bytes)
+    assert MsgPackCoder.decode(encoded) == value
+
+
+def test_msgpack_coder_unsupported_types():
+    id = uuid.uuid4()
+    datetime_obj = dt.datetime.now()
+    decoded = MsgPackCoder.decode(MsgPackCoder.encode({"id": id, "at": datetime_obj}))
+    assert decoded == {"id": str(id), "at": datetime_obj.isoformat()}
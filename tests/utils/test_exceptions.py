@@ -7,8 +7,11 @@ from app.utils.exceptions import (
     AuthorizationException,
     DuplicateEntityException,
     EntityNotFoundException,
+    InvalidCursorException,
     InvalidOTPException,
+    ServiceUnavailableException,
     TokenExpiredException,
+    TooManyRequestsException,
     UnverifiedEmailException,
     UserAlreadyActiveException,
     UserNotFoundException,
@@ -86,3 +89,26 @@ def test_duplicate_entity_exception():
         raise DuplicateEntityException(User)
     assert e.value.status_code == 409
     assert e.value.detail == "User already exists"
+
+
+def test_invalid_cursor_exception():
+    with pytest.raises(HTTPException) as e:
+        raise InvalidCursorException()
+    assert e.value.status_code == 400
+    assert e.value.detail == "Invalid pagination cursor"
+
+
+def test_service_unavailable_exception():
+    with pytest.raises(HTTPException) as e:
+        raise ServiceUnavailableException(retry_after=5)
+    assert e.value.status_code == 503
+    assert e.value.detail == "Server is busy, try again later"
+    assert e.value.headers == {"Retry-After": "5"}
+
+
+def test_too_many_requests_exception():
+    with pytest.raises(HTTPException) as e:
+        raise TooManyRequestsException("Too many streams", retry_after=10)
+    assert e.value.status_code == 429
+    assert e.value.detail == "Too many streams"
+    assert e.value.headers == {"Retry-After": "10"}
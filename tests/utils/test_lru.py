@@ -0,0 +1,69 @@
+import pytest
+
+from app.utils.lru import TTLLRUCache
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    return FakeClock()
+
+
+def test_lru_get_set(clock: FakeClock):
+    cache = TTLLRUCache[str, int](2, clock=clock)
+    cache.set("a", 1, expires_at=clock.now + 10)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.stats() == (1, 1, 1, 2)
+
+
+def test_lru_evicts_least_recently_used(clock: FakeClock):
+    cache = TTLLRUCache[str, int](2, clock=clock)
+    cache.set("a", 1, expires_at=clock.now + 10)
+    cache.set("b", 2, expires_at=clock.now + 10)
+    cache.get("a")
+    cache.set("c", 3, expires_at=clock.now + 10)
+
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_lru_evicts_expired(clock: FakeClock):
+    cache = TTLLRUCache[str, int](2, clock=clock)
+    cache.set("a", 1, expires_at=clock.now + 10)
+    clock.now += 10
+
+    assert cache.get("a") is None
+    assert len(cache) == 0
+    assert cache.misses == 1
+
+
+def test_lru_skips_already_expired(clock: FakeClock):
+    cache = TTLLRUCache[str, int](2, clock=clock)
+    cache.set("a", 1, expires_at=clock.now - 1)
+
+    assert len(cache) == 0
+
+
+def test_lru_clear(clock: FakeClock):
+    cache = TTLLRUCache[str, int](2, clock=clock)
+    cache.set("a", 1, expires_at=clock.now + 10)
+    cache.get("a")
+    cache.clear()
+
+    assert cache.stats() == (0, 0, 0, 2)
+
+
+def test_lru_invalid_maxsize():
+    with pytest.raises(ValueError):
+        TTLLRUCache(0)
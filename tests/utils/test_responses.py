@@ -0,0 +1,109 @@
+import datetime as dt
+import uuid
+from types import SimpleNamespace
+from typing import Any
+
+from fastapi.encoders import jsonable_encoder
+from starlette.responses import JSONResponse
+
+from app.schemas import Cipher, Collection, Page
+from app.schemas.enums import CipherType
+from app.utils.coders import MsgPackCoder
+from app.utils.responses import (
+    JSON_MEDIA_TYPE,
+    MSGPACK_MEDIA_TYPE,
+    SchemaResponse,
+    get_adapter,
+    negotiate_media_type,
+    schema_response,
+    validate_rows,
+)
+
+CEST = dt.timezone(dt.timedelta(hours=2))
+
+
+def cipher_row(**kwargs) -> SimpleNamespace:
+    row = {
+        "id": uuid.uuid4(),
+        "user_id": uuid.uuid4(),
+        "collection_id": None,
+        "type": CipherType.LOGIN,
+        "data": b"ZW5jcnlwdGVk",
+        "created_at": dt.datetime(2024, 1, 1, 12, 30, 15, 120000, tzinfo=dt.UTC),
+        "updated_at": None,
+        "deleted_at": None,
+        "revision": 1,
+    }
+    return SimpleNamespace(**(row | kwargs))
+
+
+def default_body(value: Any, type_: Any) -> bytes:
+    """Body of the default response path (response model serialization & json encoding)"""
+    content = get_adapter(type_).dump_python(value, mode="json")
+    return JSONResponse(jsonable_encoder(content)).body
+
+
+def test_validate_rows():
+    rows = [cipher_row(), cipher_row(collection_id=uuid.uuid4())]
+    ciphers = validate_rows(Cipher, rows)
+    assert ciphers == [Cipher.model_validate(row) for row in rows]
+
+
+def test_schema_response_matches_default_response():
+    rows = [
+        cipher_row(),
+        cipher_row(
+            updated_at=dt.datetime(2024, 1, 2, tzinfo=dt.UTC),
+            deleted_at=dt.datetime(2024, 1, 3, 8, 0, 0, 1, tzinfo=CEST),
+        ),
+    ]
+    page = Page[Cipher](
+        items=validate_rows(Cipher, rows),
+        count=2,
+        is_exact_count=True,
+        next_cursor="cursor",
+    )
+
+    response = SchemaResponse(page, type_=Page[Cipher])
+    assert response.body == default_body(page, Page[Cipher])
+    assert response.media_type == "application/json"
+
+
+def test_schema_response_non_ascii():
+    collections = [
+        Collection(
+            id=uuid.uuid4(),
+            user_id=uuid.uuid4(),
+            name="Coffre-fort 🔐",
+            created_at=dt.datetime.now(dt.UTC),
+            revision=1,
+        )
+    ]
+
+    response = SchemaResponse(collections, type_=list[Collection])
+    assert response.body == default_body(collections, list[Collection])
+
+
+def test_msgpack_schema_response_raw_bytes():
+    row = cipher_row(data=bytes(range(256)))
+    cipher = Cipher.model_validate(row)
+
+    response = schema_response(cipher, type_=Cipher, media_type=MSGPACK_MEDIA_TYPE)
+    decoded = MsgPackCoder.decode(response.body)
+
+    assert response.media_type == MSGPACK_MEDIA_TYPE
+    assert response.headers["Vary"] == "Accept"
+    assert decoded["data"] == bytes(range(256))
+    assert decoded["id"] == str(cipher.id)
+    assert decoded["type"] == CipherType.LOGIN
+
+
+def test_negotiate_media_type():
+    assert negotiate_media_type(None) == JSON_MEDIA_TYPE
+    assert negotiate_media_type("*/*") == JSON_MEDIA_TYPE
+    assert negotiate_media_type("application/json") == JSON_MEDIA_TYPE
+    assert negotiate_media_type("application/msgpack") == MSGPACK_MEDIA_TYPE
+    assert negotiate_media_type("application/x-msgpack, */*;q=0.8") == MSGPACK_MEDIA_TYPE
+    assert negotiate_media_type("application/json, application/msgpack;q=0.5") == JSON_MEDIA_TYPE
+    assert negotiate_media_type("application/msgpack;q=0") == JSON_MEDIA_TYPE
+    assert negotiate_media_type("application/msgpack;q=oops") == JSON_MEDIA_TYPE